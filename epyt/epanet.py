@@ -58,20 +58,16 @@
    implied. See the Licence for the specific language governing
    permissions and limitations under the Licence.
 """
-from pkg_resources import resource_filename
 from inspect import getmembers, isfunction, currentframe, getframeinfo
-from ctypes import cdll, byref, create_string_buffer, c_uint64, c_uint32, c_void_p, c_int, c_double, c_float, c_long, \
-    c_char_p
+from ctypes import cdll, byref, create_string_buffer, c_void_p, c_int, c_double, c_float, c_long, \
+    c_char_p, POINTER
 from types import SimpleNamespace
-import matplotlib.pyplot as plt
+from functools import lru_cache, partial
 from datetime import datetime
 from epyt import __version__, __msxversion__, __lastupdate__
 from shutil import copyfile
-from matplotlib import cm
-import matplotlib as mpl
-from pathlib import Path
-import pandas as pd
 import numpy as np
+import importlib
 import subprocess
 import platform
 import warnings
@@ -85,6 +81,54 @@ import os
 import re
 
 
+class LazyModule:
+    """ Stands in for a module that is imported on first attribute access.
+
+    matplotlib and pandas are only needed for plotting and Excel export, and
+    importing them takes most of the time of `import epyt`."""
+
+    def __init__(self, name):
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self, attr):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, attr)
+
+
+# Installed package directory, holding the bundled libraries and networks
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Host platform, checked once at import
+OS_NAME = platform.system().lower()
+IS_WINDOWS = OS_NAME == "windows"
+# MSXstep reports the time left as a double on Windows and as a long elsewhere
+MSX_TLEFT_TYPE = c_double if IS_WINDOWS else c_long
+
+# Bundled EPANET and EPANET-MSX libraries for the host platform
+if IS_WINDOWS:
+    EPANET_LIBRARY = os.path.join(PACKAGE_DIR, "libraries", "win", "epanet2.dll")
+    MSX_LIBRARY = os.path.join(PACKAGE_DIR, "libraries", "win", "epanetmsx.dll")
+elif OS_NAME == "darwin":
+    EPANET_LIBRARY = os.path.join(PACKAGE_DIR, "libraries", "mac", "libepanet2.dylib")
+    MSX_LIBRARY = os.path.join(PACKAGE_DIR, "libraries", "mac", "epanetmsx.dylib")
+else:
+    EPANET_LIBRARY = os.path.join(PACKAGE_DIR, "libraries", "glnx", "libepanet2.so")
+    MSX_LIBRARY = os.path.join(PACKAGE_DIR, "libraries", "glnx", "epanetmsx.so")
+
+plt = LazyModule("matplotlib.pyplot")
+cm = LazyModule("matplotlib.cm")
+mpl = LazyModule("matplotlib")
+pd = LazyModule("pandas")
+
+# Keys of the MSX [OPTIONS] section and the pattern used to parse them.
+MSX_OPTION_KEYS = ["AREA_UNITS", "RATE_UNITS", "SOLVER", "COUPLING", "TIMESTEP", "ATOL", "RTOL", "COMPILER",
+                   "SEGMENTS", "PECLET"]
+MSX_OPTION_PREFIXES = tuple(MSX_OPTION_KEYS)
+MSX_OPTION_RE = re.compile(r'\s*(' + '|'.join(MSX_OPTION_KEYS) + r')\s+([^;]*)')
+
+
 class ToolkitConstants:
     # Limits on the size of character arrays used to store ID names
     # and text messages.
@@ -502,6 +546,119 @@ def isList(var):
         return False
 
 
+# Encoded IDs, reused by the wrappers that pass object names to the libraries
+ENCODED_IDS = {}
+ENCODED_IDS_MAX = 4096
+
+
+def encode_id(name):
+    """ Returns the UTF-8 bytes of an ID name, reusing a previous encoding when there is one."""
+    value = ENCODED_IDS.get(name)
+    if value is None:
+        if len(ENCODED_IDS) >= ENCODED_IDS_MAX:
+            ENCODED_IDS.clear()
+        value = ENCODED_IDS[name] = name.encode("utf-8")
+    return value
+
+
+def collect_files(root, ext):
+    """ Yields the paths of all files under root ending with ext (case-insensitive).
+
+    Uses os.scandir, whose entries carry the file type from the directory
+    listing, and visits directories in the same top-down order as os.walk."""
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(ext):
+                    yield entry.path
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from collect_files(subdir, ext)
+
+
+class NetworkFiles:
+    """ Lazy index of the network files bundled with EPyT, by file name.
+
+    The package tree is scanned on the first lookup and scanned again when a
+    name is not found (or its file is gone). names() returns a snapshot from
+    the last scan: files written into the package afterwards, such as the
+    *_temp files, are listed only after a find() miss has rescanned."""
+
+    def __init__(self, ext):
+        self.ext = ext
+        self.paths = None
+        self.index = {}
+
+    def scan(self):
+        self.paths = list(collect_files(PACKAGE_DIR, self.ext))
+        self.index = {}
+        for path in self.paths:
+            # Keep the first match, as the directory walk did
+            self.index.setdefault(os.path.basename(path), path)
+
+    def names(self):
+        if self.paths is None:
+            self.scan()
+        return [os.path.basename(path) for path in self.paths]
+
+    def find(self, name):
+        path = self.index.get(name)
+        if path is None or not os.path.exists(path):
+            self.scan()
+            path = self.index.get(name)
+        return path
+
+
+BUNDLED_INP_FILES = NetworkFiles(".inp")
+BUNDLED_MSX_FILES = NetworkFiles(".msx")
+
+
+def report_tmp_files(path="."):
+    """ Returns the EPANET binary report files (@#*.txt) left in path."""
+    with os.scandir(path) as entries:
+        return [entry.path for entry in entries
+                if entry.name.startswith("@#") and entry.name.endswith(".txt")]
+
+
+@lru_cache(maxsize=16)
+def read_msx_options(msxfile, mtime_ns, size):
+    """ Parses the [OPTIONS] section of an MSX file into (key, value) pairs.
+
+    The file modification time and size are part of the cache key, so a
+    file that is rewritten on disk is parsed again. A same-size rewrite within
+    the filesystem's timestamp resolution keeps the same key, so the functions
+    that write MSX files (loadMSXFile, changeMSXOptions) also clear the cache."""
+    float_values = ["TIMESTEP", "ATOL", "RTOL", "SEGMENTS", "PECLET"]
+    values = {key: None for key in MSX_OPTION_KEYS}
+
+    # Flag to determine if we're in the [OPTIONS] section
+    in_options = False
+
+    with open(msxfile, 'r') as file:
+        for line in file:
+            # Check for [OPTIONS] section
+            if "[OPTIONS]" in line:
+                in_options = True
+            elif "[" in line and "]" in line:
+                in_options = False  # We've reached a new section
+
+            # Cheap prefix test first; most lines (comments, blanks) never reach the regex
+            if in_options and line.lstrip().startswith(MSX_OPTION_PREFIXES):
+                # Match the keys and extract values, ignoring comments and whitespace
+                match = MSX_OPTION_RE.match(line)
+                if match:
+                    key, value = match.group(1), match.group(2).strip()
+                    if key in float_values:
+                        values[key] = float(value)
+                    else:
+                        values[key] = value
+    return tuple(values.items())
+
+
 class epanet:
     """ EPyt main functions class
 
@@ -591,15 +748,9 @@ class epanet:
             self.__exist_inp_file = False
             if len(argv) == 1:
                 if not os.path.exists(self.InputFile):
-                    for root, dirs, files in os.walk(resource_filename("epyt", "")):
-                        for name in files:
-                            if name.lower().endswith(".inp"):
-                                if name == self.InputFile:
-                                    self.InputFile = os.path.join(root, self.InputFile)
-                                    break
-                        else:
-                            continue
-                        break
+                    path = BUNDLED_INP_FILES.find(self.InputFile)
+                    if path is not None:
+                        self.InputFile = path
                 self.__exist_inp_file = True
                 self.api.ENopen(self.InputFile)
                 # Save the temporary input file
@@ -2064,8 +2215,9 @@ class epanet:
         en_funcs = getmembers(epanetapi, isfunction)
         en_functions = []
         for i in en_funcs:
-            en_functions.append(i[0])
-        en_functions.remove('__init__')
+            # Skip __init__ and the wrapper's internal helpers
+            if not i[0].startswith('_'):
+                en_functions.append(i[0])
         return en_functions
 
     def getNodeActualQualitySensingNodes(self, *argv):
@@ -2372,8 +2524,8 @@ class epanet:
             value.StatusStr[i] = np.array(value.StatusStr[i])
 
         # Remove report bin txt , files @#
-        for file in Path(".").glob("@#*.txt"):
-            file.unlink()
+        for file in report_tmp_files():
+            os.unlink(file)
         value.Time = np.array(value.Time)
         value_final = EpytValues()
         val_dict = value.__dict__
@@ -2405,8 +2557,8 @@ class epanet:
             for j in value.Status[i]:
                 value.StatusStr[i].append(self.TYPEBINSTATUS[int(j)])
         # Remove report bin txt , files @#
-        for file in Path(".").glob("@#*.txt"):
-            file.unlink()
+        for file in report_tmp_files():
+            os.unlink(file)
         value.Time = np.array(value.Time)
         value_final = EpytValues()
         val_dict = value.__dict__
@@ -2831,11 +2983,12 @@ class epanet:
         for i in index:
             value = []
             try:
-                for j in range(1, tmplen[i - 1] + 1):
+                if tmplen[i - 1]:
                     if pnt:
                         return np.array(self.api.ENgetcurvevalue(i, pnt))
-                    else:
-                        value.append(self.api.ENgetcurvevalue(i, j))
+                    # One ENgetcurve call reads every point of the curve
+                    curve = self.api.ENgetcurve(i)
+                    value = [list(point) for point in zip(curve['x'], curve['y'])]
             except:
                 self.errcode = 206
                 errmssg = self.getError(self.errcode)
@@ -2875,7 +3028,7 @@ class epanet:
         >>> d.getError(error)
         """
         errmssg = create_string_buffer(150)
-        self.api._lib.ENgeterror(Errcode, byref(errmssg), 150)
+        self.api._lib.ENgeterror(int(Errcode), errmssg, 150)
         return errmssg.value.decode()
 
     def getFlowUnits(self):
@@ -2900,9 +3053,9 @@ class epanet:
         funcs = getmembers(epanetapi, isfunction)
         lib_functions = []
         for i in funcs:
-            if not i[0].startswith('_api'):
+            # Skip __init__ and the wrapper's internal helpers
+            if not i[0].startswith('_'):
                 lib_functions.append(i[0])
-        lib_functions.remove('__init__')
         return lib_functions
 
     def getLinkComment(self, *argv):
@@ -3538,29 +3691,25 @@ class epanet:
         >>> linkInf  =  d.getLinksInfo()                  # get links info as object
         >>> linDiam  =  d.getLinksInfo().LinkDiameter     # get link diameters
 
+        Each property is read with ENgetlinkvalues, which is a single toolkit call only
+        when the library provides EN_getlinkvalues (EPANET 2.3+); with EPANET 2.2 it
+        still makes one call per link.
+
         See also getLinkType, getLinkTypeIndex, getLinkDiameter,
         getLinkLength, getLinkRoughnessCoeff, getLinkMinorLossCoeff.
         """
         value = EpytValues()
-        value.LinkDiameter = []
-        value.LinkLength = []
-        value.LinkRoughnessCoeff = []
-        value.LinkMinorLossCoeff = []
-        value.LinkInitialStatus = []
-        value.LinkInitialSetting = []
-        value.LinkBulkReactionCoeff = []
-        value.LinkWallReactionCoeff = []
+        value.LinkDiameter = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_DIAMETER).tolist()
+        value.LinkLength = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_LENGTH).tolist()
+        value.LinkRoughnessCoeff = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_ROUGHNESS).tolist()
+        value.LinkMinorLossCoeff = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_MINORLOSS).tolist()
+        value.LinkInitialStatus = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_INITSTATUS).tolist()
+        value.LinkInitialSetting = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_INITSETTING).tolist()
+        value.LinkBulkReactionCoeff = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_KBULK).tolist()
+        value.LinkWallReactionCoeff = self.api.ENgetlinkvalues(self.ToolkitConstants.EN_KWALL).tolist()
         value.LinkTypeIndex = []
         value.NodesConnectingLinksIndex = [[0, 0] for _ in range(self.getLinkCount())]
         for i in range(1, self.getLinkCount() + 1):
-            value.LinkDiameter.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_DIAMETER))
-            value.LinkLength.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_LENGTH))
-            value.LinkRoughnessCoeff.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_ROUGHNESS))
-            value.LinkMinorLossCoeff.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_MINORLOSS))
-            value.LinkInitialStatus.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_INITSTATUS))
-            value.LinkInitialSetting.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_INITSETTING))
-            value.LinkBulkReactionCoeff.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_KBULK))
-            value.LinkWallReactionCoeff.append(self.api.ENgetlinkvalue(i, self.ToolkitConstants.EN_KWALL))
             value.LinkTypeIndex.append(self.api.ENgetlinktype(i))
             xy = self.api.ENgetlinknodes(i)
             value.NodesConnectingLinksIndex[i - 1][0] = xy[0]
@@ -4026,12 +4175,7 @@ class epanet:
 
     def getNetworksDatabase(self):
         """Return all EPANET Input Files from EPyT database."""
-        networksdb = []
-        for root, dirs, files in os.walk(resource_filename("epyt", "")):
-            for name in files:
-                if name.lower().endswith(".inp") and '_temp' not in name:
-                    networksdb.append(name)
-        return networksdb
+        return [name for name in BUNDLED_INP_FILES.names() if '_temp' not in name]
 
     def getNodeActualDemandSensingNodes(self, *argv):
         """ Retrieves the computed demand values at some sensing nodes.
@@ -6582,9 +6726,8 @@ class epanet:
 
     def runEPANETexe(self):
         """ Runs epanet .exe file """
-        arch = sys.platform
         [inpfile, rptfile, binfile] = self.__createTempfiles(self.TempInpFile)
-        if arch == 'win64' or arch == 'win32':
+        if IS_WINDOWS:
             r = '"%s.exe" "%s" %s %s & exit' % (self.LibEPANET[:-4], inpfile, rptfile, binfile)
 
         else:
@@ -8484,9 +8627,9 @@ class epanet:
         if not isList(index):
             index = [index]
         index_ = []
+        tankIndices = self.getNodeTankIndex()
         for i in index:
-            if i not in self.getNodeTankIndex():
-                tankIndices = self.getNodeTankIndex()
+            if i not in tankIndices:
                 index_.append(tankIndices[i - 1])
         if len(index_) != 0: index = index_
         if not isList(elev):
@@ -10401,11 +10544,9 @@ class epanet:
                 files_to_delete = [self.TempInpFile[0:-4] + '.txt', self.InputFile[0:-4] + '.txt', self.BinTempfile]
                 for file in files_to_delete:
                     safe_delete(file)
-                for file in Path(".").glob("@#*.txt"):
-                    safe_delete(file)
+                safe_delete(report_tmp_files())
 
-                arch = sys.platform
-                if arch == 'win64' or arch == 'win32':
+                if IS_WINDOWS:
                     cwd = os.getcwd()
                     files = os.listdir(cwd)
                     tmp_files = [
@@ -10831,13 +10972,13 @@ class epanet:
         if len(argv) > 0:
             index = argv[0]
             if isinstance(index, (list, np.ndarray)):
+                getlinkvalue = self.api.ENgetlinkvalue
                 for i in index:
-                    values.append(self.api.ENgetlinkvalue(i, code_p))
+                    values.append(getlinkvalue(i, code_p))
             else:
                 values = self.api.ENgetlinkvalue(index, code_p)
         else:
-            for i in range(self.getLinkCount()):
-                values.append(self.api.ENgetlinkvalue(i + 1, code_p))
+            return self.api.ENgetlinkvalues(code_p)
         return np.array(values)
 
     def __getNodeIndices(self, *argv):
@@ -10860,13 +11001,13 @@ class epanet:
         if len(argv) > 0:
             index = argv[0]
             if isinstance(index, (list, np.ndarray)):
+                getnodevalue = self.api.ENgetnodevalue
                 for i in index:
-                    value.append(self.api.ENgetnodevalue(i, code_p))
+                    value.append(getnodevalue(i, code_p))
             else:
                 return self.api.ENgetnodevalue(index, code_p)
         else:
-            for i in range(self.getNodeCount()):
-                value.append(self.api.ENgetnodevalue(i + 1, code_p))
+            return self.api.ENgetnodevalues(code_p)
         return np.array(value)
 
     def __getNodeJunctionIndices(self, *argv):
@@ -10931,7 +11072,7 @@ class epanet:
         return np.array(values)
 
     def __isMember(self, A, B):
-        return [np.sum(a == B) for a in np.array(A)]
+        return np.isin(np.array(A), B)
 
     def __readEpanetBin(self, f, binfile, *argv):
         value = EpytValues()
@@ -11104,6 +11245,8 @@ class epanet:
                               controlLevel)
 
     def __setEval(self, func, code_pstr, Type, value, *argv):
+        fun = getattr(self.api, func)
+        code_p = getattr(self.ToolkitConstants, 'EN_' + code_pstr)
         if len(argv) == 1:
             index = value
             value = argv[0]
@@ -11112,28 +11255,22 @@ class epanet:
                 for i in index:
                     if np.isnan(value[j]):
                         continue
-                    strFunc = 'self.api.' + func + '(' + str(
-                        i) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value[j]) + ')'
-                    eval(strFunc)
+                    fun(i, code_p, value[j])
                     j += 1
             else:
-                strFunc = 'self.api.' + func + '(' + str(
-                    index) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value) + ')'
-                eval(strFunc)
+                fun(index, code_p, value)
         else:
             count = 0
             if Type == 'LINK':
                 count = self.getLinkCount()
             elif Type == 'NODE':
                 count = self.getNodeCount()
-            for i in range(count):
-                if np.isnan(value[i]):
-                    continue
-                strFunc = 'self.api.' + func + '(' + str(
-                    i + 1) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value[i]) + ')'
-                eval(strFunc)
+            indices = [i + 1 for i in range(count) if not np.isnan(value[i])]
+            getattr(self.api, func + 's')(indices, code_p, [value[i - 1] for i in indices])
 
     def __setEvalLinkNode(self, func, code_pstr, Type, value, *argv):
+        fun = getattr(self.api, func)
+        code_p = getattr(self.ToolkitConstants, 'EN_' + code_pstr)
         if len(argv) == 1:
             index = value
             value = argv[0]
@@ -11141,15 +11278,11 @@ class epanet:
                 j = 0
                 if isinstance(value, list):
                     for i in index:
-                        strFunc = 'self.api.' + func + '(' + str(
-                            i) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value[j]) + ')'
-                        eval(strFunc)
+                        fun(i, code_p, value[j])
                         j += 1
                 else:
                     for i in index:
-                        strFunc = 'self.api.' + func + '(' + str(
-                            i) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value) + ')'
-                        eval(strFunc)
+                        fun(i, code_p, value)
                         j += 1
             else:
                 Index = []
@@ -11163,9 +11296,7 @@ class epanet:
                     Index = index
                     if isinstance(value, (list, np.ndarray)):
                         value = value[0]
-                strFunc = 'self.api.' + func + '(' + str(
-                    Index) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value) + ')'
-                eval(strFunc)
+                fun(Index, code_p, value)
         else:
             count = 0
             indices = []
@@ -11177,14 +11308,10 @@ class epanet:
                 indices = self.getLinkPumpIndex()
             if isinstance(value, (list, np.ndarray)):
                 for i in range(count):
-                    strFunc = 'self.api.' + func + '(' + str(
-                        indices[i]) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value[i]) + ')'
-                    eval(strFunc)
+                    fun(indices[i], code_p, value[i])
             else:
                 for i in range(count):
-                    strFunc = 'self.api.' + func + '(' + str(
-                        indices[i]) + ',' + 'self.ToolkitConstants.EN_' + code_pstr + ',' + str(value) + ')'
-                    eval(strFunc)
+                    fun(indices[i], code_p, value)
 
     def __setFlowUnits(self, unitcode, *argv):
         self.api.ENsetflowunits(unitcode)
@@ -11204,6 +11331,7 @@ class epanet:
             indices = value
             param = argv[0]
 
+        setfun = getattr(self.api, fun)
         for c in range(categ):
             if len(argv) == 0 and type(value) is dict:
                 param = value[c]
@@ -11218,11 +11346,11 @@ class epanet:
                     if c + 1 > self.getNodeDemandCategoriesNumber(i):
                         self.addNodeJunctionDemand(i, param[j])
                     else:
-                        eval('self.api.' + fun + '(i, c, param[j])')
+                        setfun(i, c, param[j])
                 elif categ == 1:
                     self.api.ENsetnodevalue(i, propertyCode, param[j])
                 else:
-                    eval('self.api.' + fun + '(i, categ, param[j])')
+                    setfun(i, categ, param[j])
                 j += 1
 
     """MSX Functions"""
@@ -11239,19 +11367,14 @@ class epanet:
         d.loadMSXFile(msxname, customMSXlib=msxlib)"""
 
         if not os.path.exists(msxname):
-            for root, dirs, files in os.walk(resource_filename("epyt", "")):
-                for name in files:
-                    if name.lower().endswith(".msx"):
-                        if name == msxname:
-                            msxname = os.path.join(root, msxname)
-                            break
-                else:
-                    continue
-                break
+            path = BUNDLED_MSX_FILES.find(msxname)
+            if path is not None:
+                msxname = path
 
         self.MSXFile = msxname[:-4]
         self.MSXTempFile = msxname[:-4] + '_temp.msx'
         copyfile(msxname, self.MSXTempFile)
+        read_msx_options.cache_clear()
         self.msx = epanetmsxapi(self.MSXTempFile, customMSXlib=customMSXlib, display_msg=self.display_msg,
                                 msxrealfile=self.MSXFile)
 
@@ -11300,8 +11423,7 @@ class epanet:
                d.unloadMSX()
                """
         self.msx.MSXclose()
-        arch = sys.platform
-        if arch == 'win64' or arch == 'win32':
+        if IS_WINDOWS:
             msx_temp_files = list(filter(lambda f: os.path.isfile(os.path.join(os.getcwd(), f))
                                                    and f.startswith("msx") and "." not in f, os.listdir(os.getcwd())))
             safe_delete(msx_temp_files)
@@ -11497,37 +11619,9 @@ class epanet:
         # SEGMENTS value
         # PECLET value
         try:
-            # Key-value pairs to search for
-            keys = ["AREA_UNITS", "RATE_UNITS", "SOLVER", "COUPLING", "TIMESTEP", "ATOL", "RTOL", "COMPILER",
-                    "SEGMENTS", \
-                    "PECLET"]
-            float_values = ["TIMESTEP", "ATOL", "RTOL", "SEGMENTS", "PECLET"]
-            values = {key: None for key in keys}
-
-            # Flag to determine if we're in the [OPTIONS] section
-            in_options = False
-
-            # Open and read the file
-            with open(self.MSXTempFile, 'r') as file:
-                for line in file:
-                    # Check for [OPTIONS] section
-                    if "[OPTIONS]" in line:
-                        in_options = True
-                    elif "[" in line and "]" in line:
-                        in_options = False  # We've reached a new section
-
-                    if in_options:
-                        # Pattern to match the keys and extract values, ignoring comments and whitespace
-                        pattern = re.compile(r'^\s*(' + '|'.join(keys) + r')\s+(.*?)\s*(?:;.*)?$')
-                        match = pattern.search(line)
-                        if match:
-                            key, value = match.groups()
-                            if key in float_values:
-                                values[key] = float(value)
-                            else:
-                                values[key] = value
-
-            return SimpleNamespace(**values)
+            stat = os.stat(self.MSXTempFile)
+            options = read_msx_options(self.MSXTempFile, stat.st_mtime_ns, stat.st_size)
+            return SimpleNamespace(**dict(options))
         except FileNotFoundError:
             warnings.warn("Please load MSX File.")
             return {}
@@ -12066,15 +12160,12 @@ class epanet:
                 tline = tline.strip()
                 if not tline:
                     continue
-                tok = tline.split()[0]
-
-                if not tok:
-                    continue
-                if tok[0] == ';':
+                # The first character of the stripped line is the first character of its first token
+                if tline[0] == ';':
                     continue
 
-                if tok[0] == '[':
-
+                if tline[0] == '[':
+                    tok = tline.split(None, 1)[0]
                     if tok[1:6].upper() == 'TERMS':
                         sect = 1
                         continue
@@ -12406,9 +12497,10 @@ class epanet:
             options_index = -1  # Default to -1 in case the [OPTIONS] section does not exist
             flag = 0
             for i, line in enumerate(lines):
-                if line.strip() == '[OPTIONS]':
+                stripped = line.strip()
+                if stripped == '[OPTIONS]':
                     options_index = i
-                elif line.strip().startswith(param):
+                elif stripped.startswith(param):
                     lines[i] = param + "\t" + str(change) + "\n"
                     flag = 1
             if flag == 0 and options_index != -1:
@@ -12419,6 +12511,7 @@ class epanet:
 
         self.msx.MSXclose()
         copyfile(options_section, self.MSXTempFile)
+        read_msx_options.cache_clear()
         try:
             os.remove(options_section)
         except:
@@ -13226,46 +13319,42 @@ class epanet:
                     d.unload()
                  """
         filename = msx.FILENAME
+        # Writing the TITLE section
+        parts = ["[TITLE]\n", msx.TITLE]
+
+        # Writing the OPTIONS section
+        options = {
+            "AREA_UNITS": msx.AREA_UNITS,
+            "RATE_UNITS": msx.RATE_UNITS,
+            "SOLVER": msx.SOLVER,
+            "TIMESTEP": msx.TIMESTEP,
+            "COMPILER": msx.COMPILER,
+            "COUPLING": msx.COUPLING,
+            "RTOL": msx.RTOL,
+            "ATOL": msx.ATOL
+        }
+        parts.append("\n\n[OPTIONS]")
+        parts.extend("\n{}\t{}".format(key, value) for key, value in options.items())
+        # Sections with list data
+        sections = {
+            "[SPECIES]": msx.SPECIES,
+            "[COEFFICIENTS]": msx.COEFFICIENTS,
+            "[TERMS]": msx.TERMS,
+            "[PIPES]": msx.PIPES,
+            "[TANKS]": msx.TANKS,
+            "[SOURCES]": msx.SOURCES,
+            "[QUALITY]": msx.QUALITY,
+            "[GLOBAL]": msx.GLOBAL,
+            "[PARAMETERS]": msx.PARAMETERS,
+            "[PATTERNS]": msx.PATERNS
+        }
+        for section, items in sections.items():
+            parts.append("\n\n{}".format(section))
+            parts.extend("\n{}".format(item) for item in items)
+
+        parts.append('\n\n[REPORT]\nNODES ALL\nLINKS ALL\n')
         with open(filename, 'w') as f:
-            # Writing the TITLE section
-            f.write("[TITLE]\n")
-            f.write(msx.TITLE)
-
-            # Writing the OPTIONS section
-            options = {
-                "AREA_UNITS": msx.AREA_UNITS,
-                "RATE_UNITS": msx.RATE_UNITS,
-                "SOLVER": msx.SOLVER,
-                "TIMESTEP": msx.TIMESTEP,
-                "COMPILER": msx.COMPILER,
-                "COUPLING": msx.COUPLING,
-                "RTOL": msx.RTOL,
-                "ATOL": msx.ATOL
-            }
-            f.write("\n\n[OPTIONS]")
-            for key, value in options.items():
-                f.write("\n{}\t{}".format(key, value))
-            # Sections with list data
-            sections = {
-                "[SPECIES]": msx.SPECIES,
-                "[COEFFICIENTS]": msx.COEFFICIENTS,
-                "[TERMS]": msx.TERMS,
-                "[PIPES]": msx.PIPES,
-                "[TANKS]": msx.TANKS,
-                "[SOURCES]": msx.SOURCES,
-                "[QUALITY]": msx.QUALITY,
-                "[GLOBAL]": msx.GLOBAL,
-                "[PARAMETERS]": msx.PARAMETERS,
-                "[PATTERNS]": msx.PATERNS
-            }
-            for section, items in sections.items():
-                f.write("\n\n{}".format(section))
-                for item in items:
-                    f.write("\n{}".format(item))
-
-            f.write('\n\n[REPORT]\n')
-            f.write('NODES ALL\n')
-            f.write('LINKS ALL\n')
+            f.write("".join(parts))
 
     def setMSXPatternMatrix(self, pattern_matrix):
         """Sets all of the multiplier factors for all patterns
@@ -13404,6 +13493,160 @@ class epanet:
             plt.show()
             
 
+# Placeholders for EPANET's REAL type (and pointers to it) in EN_ARGTYPES: a double
+# in the project-handle (EN_) functions and a float in the legacy (EN) functions.
+REAL = "REAL"
+REAL_PTR = "REAL*"
+
+# Argument types of the EPANET toolkit functions, without the leading project handle.
+EN_ARGTYPES = {
+    "addcontrol": [c_int, c_int, REAL, c_int, REAL, POINTER(c_int)],
+    "addcurve": [c_char_p],
+    "adddemand": [c_int, REAL, c_char_p, c_char_p],
+    "addlink": [c_char_p, c_int, c_char_p, c_char_p, POINTER(c_int)],
+    "addnode": [c_char_p, c_int, POINTER(c_int)],
+    "addpattern": [c_char_p],
+    "addrule": [c_char_p],
+    "clearreport": [],
+    "close": [],
+    "closeH": [],
+    "closeQ": [],
+    "copyreport": [c_char_p],
+    "deletecontrol": [c_int],
+    "deletecurve": [c_int],
+    "deletedemand": [c_int, c_int],
+    "deletelink": [c_int, c_int],
+    "deletenode": [c_int, c_int],
+    "deletepattern": [c_int],
+    "deleteproject": [],
+    "deleterule": [c_int],
+    "getaveragepatternvalue": [c_int, REAL_PTR],
+    "getbasedemand": [c_int, c_int, REAL_PTR],
+    "getcomment": [c_int, c_int, c_char_p],
+    "getcontrol": [c_int, POINTER(c_int), POINTER(c_int), REAL_PTR, POINTER(c_int), REAL_PTR],
+    "getcoord": [c_int, POINTER(c_double), POINTER(c_double)],
+    "getcount": [c_int, POINTER(c_int)],
+    "getcurve": [c_int, c_char_p, POINTER(c_int), REAL_PTR, REAL_PTR],
+    "getcurveid": [c_int, c_char_p],
+    "getcurveindex": [c_char_p, POINTER(c_int)],
+    "getcurvelen": [c_int, POINTER(c_int)],
+    "getcurvetype": [c_int, POINTER(c_int)],
+    "getcurvevalue": [c_int, c_int, REAL_PTR, REAL_PTR],
+    "getdemandindex": [c_int, c_char_p, POINTER(c_int)],
+    "getdemandmodel": [POINTER(c_int), REAL_PTR, REAL_PTR, REAL_PTR],
+    "getdemandname": [c_int, c_int, c_char_p],
+    "getdemandpattern": [c_int, c_int, POINTER(c_int)],
+    "getelseaction": [c_int, c_int, POINTER(c_int), POINTER(c_int), REAL_PTR],
+    "getflowunits": [POINTER(c_int)],
+    "getheadcurveindex": [c_int, POINTER(c_int)],
+    "getlinkid": [c_int, c_char_p],
+    "getlinkindex": [c_char_p, POINTER(c_int)],
+    "getlinknodes": [c_int, POINTER(c_int), POINTER(c_int)],
+    "getlinktype": [c_int, POINTER(c_int)],
+    "getlinkvalue": [c_int, c_int, REAL_PTR],
+    "getlinkvalues": [c_int, REAL_PTR],
+    "getnodeid": [c_int, c_char_p],
+    "getnodeindex": [c_char_p, POINTER(c_int)],
+    "getnodetype": [c_int, POINTER(c_int)],
+    "getnodevalue": [c_int, c_int, REAL_PTR],
+    "getnodevalues": [c_int, REAL_PTR],
+    "getnumdemands": [c_int, POINTER(c_int)],
+    "getoption": [c_int, REAL_PTR],
+    "getpatternid": [c_int, c_char_p],
+    "getpatternindex": [c_char_p, POINTER(c_int)],
+    "getpatternlen": [c_int, POINTER(c_int)],
+    "getpatternvalue": [c_int, c_int, REAL_PTR],
+    "getpremise": [c_int, c_int, POINTER(c_int), POINTER(c_int), POINTER(c_int),
+                   POINTER(c_int), POINTER(c_int), POINTER(c_int), REAL_PTR],
+    "getpumptype": [c_int, POINTER(c_int)],
+    "getqualinfo": [POINTER(c_int), c_char_p, c_char_p, POINTER(c_int)],
+    "getqualtype": [POINTER(c_int), POINTER(c_int)],
+    "getresultindex": [c_int, c_int, POINTER(c_int)],
+    "getrule": [c_int, POINTER(c_int), POINTER(c_int), POINTER(c_int), REAL_PTR],
+    "getruleID": [c_int, c_char_p],
+    "getstatistic": [c_int, REAL_PTR],
+    "getthenaction": [c_int, c_int, POINTER(c_int), POINTER(c_int), REAL_PTR],
+    "gettimeparam": [c_int, POINTER(c_long)],
+    "gettitle": [c_char_p, c_char_p, c_char_p],
+    "getvertex": [c_int, c_int, POINTER(c_double), POINTER(c_double)],
+    "getvertexcount": [c_int, POINTER(c_int)],
+    "init": [c_char_p, c_char_p, c_int, c_int],
+    "initH": [c_int],
+    "initQ": [c_int],
+    "nextH": [POINTER(c_long)],
+    "nextQ": [POINTER(c_long)],
+    "open": [c_char_p, c_char_p, c_char_p],
+    "openH": [],
+    "openQ": [],
+    "report": [],
+    "resetreport": [],
+    "runH": [POINTER(c_long)],
+    "runQ": [POINTER(c_long)],
+    "saveH": [],
+    "savehydfile": [c_char_p],
+    "saveinpfile": [c_char_p],
+    "setbasedemand": [c_int, c_int, REAL],
+    "setcomment": [c_int, c_int, c_char_p],
+    "setcontrol": [c_int, c_int, c_int, REAL, c_int, REAL],
+    "setcoord": [c_int, c_double, c_double],
+    "setcurve": [c_int, REAL_PTR, REAL_PTR, c_int],
+    "setcurveid": [c_int, c_char_p],
+    "setcurvevalue": [c_int, c_int, REAL, REAL],
+    "setdemandmodel": [c_int, REAL, REAL, REAL],
+    "setdemandname": [c_int, c_int, c_char_p],
+    "setdemandpattern": [c_int, c_int, c_int],
+    "setelseaction": [c_int, c_int, c_int, c_int, REAL],
+    "setflowunits": [c_int],
+    "setheadcurveindex": [c_int, c_int],
+    "setjuncdata": [c_int, REAL, REAL, c_char_p],
+    "setlinkid": [c_int, c_char_p],
+    "setlinknodes": [c_int, c_int, c_int],
+    "setlinktype": [POINTER(c_int), c_int, c_int],
+    "setlinkvalue": [c_int, c_int, REAL],
+    "setnodeid": [c_int, c_char_p],
+    "setnodevalue": [c_int, c_int, REAL],
+    "setoption": [c_int, REAL],
+    "setpattern": [c_int, REAL_PTR, c_int],
+    "setpatternid": [c_int, c_char_p],
+    "setpatternvalue": [c_int, c_int, REAL],
+    "setpipedata": [c_int, REAL, REAL, REAL, REAL],
+    "setpremise": [c_int, c_int, c_int, c_int, c_int, c_int, c_int, c_int, REAL],
+    "setpremiseindex": [c_int, c_int, c_int],
+    "setpremisestatus": [c_int, c_int, c_int],
+    "setpremisevalue": [c_int, c_int, REAL],
+    "setqualtype": [c_int, c_char_p, c_char_p, c_char_p],
+    "setreport": [c_char_p],
+    "setrulepriority": [c_int, REAL],
+    "setstatusreport": [c_int],
+    "settankdata": [c_int, REAL, REAL, REAL, REAL, REAL, REAL, c_char_p],
+    "setthenaction": [c_int, c_int, c_int, c_int, REAL],
+    "settimeparam": [c_int, c_long],
+    "settitle": [c_char_p, c_char_p, c_char_p],
+    "setvertices": [c_int, POINTER(c_double), POINTER(c_double), c_int],
+    "solveH": [],
+    "solveQ": [],
+    "stepQ": [POINTER(c_long)],
+    "usehydfile": [c_char_p],
+    "writeline": [c_char_p],
+}
+
+# Loaded EPANET libraries by absolute path: (CDLL, {symbol: function with argtypes declared})
+EPANET_LIBRARIES = {}
+
+
+def load_epanet_library(path):
+    """ Loads the EPANET library at path, once per process and path. The returned table
+    is shared by every epanetapi using that library and filled as functions are bound."""
+    key = os.path.abspath(path)
+    entry = EPANET_LIBRARIES.get(key)
+    if entry is None:
+        lib = cdll.LoadLibrary(path)
+        # ENgeterror takes no project handle, so it is typed here rather than bound per project
+        lib.ENgeterror.argtypes = [c_int, c_char_p, c_int]
+        entry = EPANET_LIBRARIES[key] = (lib, {})
+    return entry
+
+
 class epanetapi:
     """
     EPANET Toolkit functions - API
@@ -13418,6 +13661,10 @@ class epanetapi:
         version     EPANET version to use (currently 2.2)
         """
         self._lib = None
+        self._functions = {}
+        # Results of ENgetcount, the ID/index lookups, link/node types and end nodes, the
+        # title, vertex counts and library version, cleared by every call that can change them
+        self._cache = {}
         self.errcode = 0
         self.inpfile = None
         self.rptfile = None
@@ -13432,24 +13679,91 @@ class epanetapi:
             else:
                 self.LibEPANET = customlib
             loadlib = False
-            self._lib = cdll.LoadLibrary(self.LibEPANET)
+            self._lib, self._functions = load_epanet_library(self.LibEPANET)
             self.LibEPANETpath = os.path.dirname(self.LibEPANET)
 
         if loadlib:
-            libname = f"epanet2"
-            ops = platform.system().lower()
-            if ops in ["windows"]:
-                self.LibEPANET = resource_filename("epyt", os.path.join("libraries", "win", f"{libname}.dll"))
-            elif ops in ["darwin"]:
-                self.LibEPANET = resource_filename("epyt", os.path.join("libraries", f"mac/lib{libname}.dylib"))
-            else:
-                self.LibEPANET = resource_filename("epyt", os.path.join("libraries", f"glnx/lib{libname}.so"))
-
-            self._lib = cdll.LoadLibrary(self.LibEPANET)
+            self.LibEPANET = EPANET_LIBRARY
+            self._lib, self._functions = load_epanet_library(self.LibEPANET)
             self.LibEPANETpath = os.path.dirname(self.LibEPANET)
 
         if float(version) >= 2.2 and ph:
-            self._ph = c_uint64()
+            # Mutated in place (never rebound), so the bound functions below keep a valid handle
+            self._ph = c_void_p()
+        # Type of EPANET's REAL: double in the project-handle API, float in the legacy API
+        self._real = c_float if self._ph is None else c_double
+        # Out-parameters shared by the scalar getters; read back before returning
+        self.__int = c_int()
+        self.__long = c_long()
+        self.__real = self._real()
+        self.__buffers = {}
+        # Optional toolkit functions (e.g. EN_getlinkvalues) found missing from the library
+        self.__missing = set()
+        # ENgetcontrol's five out-parameters, allocated once
+        self.__control = (c_int(), c_int(), self._real(), c_int(), self._real())
+
+    def __getattr__(self, attr):
+        """ Binds a toolkit function on first use, e.g. self._getcount for EN_getcount/ENgetcount,
+        and caches it on the instance so later calls skip this lookup."""
+        name = attr[1:]
+        if attr[:1] != "_" or name not in EN_ARGTYPES or self.__dict__.get("_lib") is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+        fn = self._bind(name)
+        if fn is None:
+            raise AttributeError(f"EPANET library does not provide '{name}'")
+        setattr(self, attr, fn)
+        return fn
+
+    def _bind(self, name):
+        """ Returns the toolkit function `name` (e.g. 'getcount') with its argument types
+        declared. In project-handle mode this is EN_name with the handle already bound,
+        otherwise ENname; None if the library does not export it."""
+        symbol = ("EN_" if self._ph is not None else "EN") + name
+        fn = self._functions.get(symbol)
+        if fn is None:
+            fn = getattr(self._lib, symbol, None)
+            if fn is None:
+                return None
+            if self._ph is not None:
+                real, prefix = c_double, [c_void_p]
+            else:
+                real, prefix = c_float, []
+            fn.argtypes = prefix + [real if t is REAL else POINTER(real) if t is REAL_PTR else t
+                                    for t in EN_ARGTYPES[name]]
+            self._functions[symbol] = fn
+        return partial(fn, self._ph) if self._ph is not None else fn
+
+    def __optional(self, name):
+        """ Returns the bound toolkit function `name`, or None if the library does not
+        export it. A missing function is remembered, so it is looked up only once."""
+        if name in self.__missing:
+            return None
+        fn = getattr(self, "_" + name, None)
+        if fn is None:
+            self.__missing.add(name)
+        return fn
+
+    def __string_buffer(self, size, slot=0):
+        """ Returns a reusable, emptied char buffer of the given size. Callers must copy
+            the contents out (e.g. with .value.decode()) before the next call, and use a
+            different slot for each buffer they need at the same time."""
+        buffer = self.__buffers.get((size, slot))
+        if buffer is None:
+            buffer = self.__buffers[size, slot] = create_string_buffer(size)
+        else:
+            buffer[0] = b'\x00'
+        return buffer
+
+    def __real_array(self, values, real=None, size=0):
+        """ Returns a pointer to values as a contiguous array of the API's REAL type, or of real
+            for functions that take doubles in both APIs. The values are copied only when their
+            dtype or layout differ. Raises ValueError if there are fewer than size values, since
+            the toolkit would read past the end of the array."""
+        real = real or self._real
+        values = np.ascontiguousarray(values, dtype=real)
+        if values.size < size:
+            raise ValueError(f"Got {values.size} values, expected at least {size}.")
+        return values.ctypes.data_as(POINTER(real))
 
     def ENepanet(self, inpfile="", rptfile="", binfile=""):
         """ Runs a complete EPANET simulation
@@ -13458,11 +13772,14 @@ class epanetapi:
         rptfile     Output file to report to
         binfile     Results file to generate
         """
+        self._cache.clear()
         self.inpfile = inpfile.encode("utf-8")
         self.rptfile = rptfile.encode("utf-8")
         self.binfile = binfile.encode("utf-8")
-        self.errcode = self._lib.ENepanet(self.inpfile, self.rptfile, self.binfile, c_void_p())
-        self.ENgeterror()
+        # None is passed as a NULL progress callback
+        self.errcode = self._lib.ENepanet(self.inpfile, self.rptfile, self.binfile, None)
+        if self.errcode:
+            self.ENgeterror()
 
     def ENaddcontrol(self, conttype, lindex, setting, nindex, level):
         """ Adds a new simple control to a project.
@@ -13479,14 +13796,11 @@ class epanetapi:
         Returns:
         cindex 	index of the new control.
         """
-        index = c_int()
-        if self._ph is not None:
-            self.errcode = self._lib.EN_addcontrol(self._ph, conttype, int(lindex), c_double(setting), nindex,
-                                                   c_double(level), byref(index))
-        else:
-            self.errcode = self._lib.ENaddcontrol(conttype, int(lindex), c_float(setting), nindex,
-                                                  c_float(level), byref(index))
-        self.ENgeterror()
+        self._cache.clear()
+        index = self.__int
+        self.errcode = self._addcontrol(conttype, int(lindex), setting, nindex, level, byref(index))
+        if self.errcode:
+            self.ENgeterror()
         return index.value
 
     def ENaddcurve(self, cid):
@@ -13500,13 +13814,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___curves.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_addcurve(self._ph, cid.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENaddcurve(cid.encode('utf-8'))
+        self.errcode = self._addcurve(encode_id(cid))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENadddemand(self, nodeIndex, baseDemand, demandPattern, demandName):
         """ Appends a new demand to a junction node demands list.
@@ -13521,17 +13834,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_adddemand(self._ph, int(nodeIndex), c_double(baseDemand),
-                                                  demandPattern.encode("utf-8"),
-                                                  demandName.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENadddemand(int(nodeIndex), c_float(baseDemand),
-                                                 demandPattern.encode("utf-8"),
-                                                 demandName.encode("utf-8"))
+        self.errcode = self._adddemand(int(nodeIndex), baseDemand, encode_id(demandPattern), encode_id(demandName))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENaddlink(self, linkid, linktype, fromnode, tonode):
@@ -13549,15 +13857,12 @@ class epanetapi:
         index the index of the newly added link.
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
-        index = c_int()
+        self._cache.clear()
+        index = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_addlink(self._ph, linkid.encode('utf-8'), linktype,
-                                                fromnode.encode('utf-8'), tonode.encode('utf-8'), byref(index))
-        else:
-            self.errcode = self._lib.ENaddlink(linkid.encode('utf-8'), linktype,
-                                               fromnode.encode('utf-8'), tonode.encode('utf-8'), byref(index))
-        self.ENgeterror()
+        self.errcode = self._addlink(encode_id(linkid), linktype, encode_id(fromnode), encode_id(tonode), byref(index))
+        if self.errcode:
+            self.ENgeterror()
         return index.value
 
     def ENaddnode(self, nodeid, nodetype):
@@ -13573,14 +13878,13 @@ class epanetapi:
         index    the index of the newly added node.
         See also EN_NodeProperty, NodeType
         """
-        index = c_int()
+        self._cache.clear()
+        index = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_addnode(self._ph, nodeid.encode("utf-8"), nodetype, byref(index))
-        else:
-            self.errcode = self._lib.ENaddnode(nodeid.encode("utf-8"), nodetype, byref(index))
+        self.errcode = self._addnode(encode_id(nodeid), nodetype, byref(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return index.value
 
     def ENaddpattern(self, patid):
@@ -13593,13 +13897,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___patterns.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_addpattern(self._ph, patid.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENaddpattern(patid.encode("utf-8"))
+        self.errcode = self._addpattern(encode_id(patid))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENaddrule(self, rule):
@@ -13613,13 +13916,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___rules.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_addrule(self._ph, rule.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENaddrule(rule.encode('utf-8'))
+        self.errcode = self._addrule(rule.encode('utf-8'))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENclearreport(self):
         """ Clears the contents of a project's report file.
@@ -13629,12 +13931,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_clearreport(self._ph)
-        else:
-            self.errcode = self._lib.ENclearreport()
+        self.errcode = self._clearreport()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENclose(self):
         """ Closes a project and frees all of its memory.
@@ -13643,13 +13943,13 @@ class epanetapi:
 
         See also ENopen
         """
+        self._cache.clear()
+        self.errcode = self._close()
         if self._ph is not None:
-            self.errcode = self._lib.EN_close(self._ph)
-            self._ph = c_uint64()
-        else:
-            self.errcode = self._lib.ENclose()
+            self._ph.value = None
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENcloseH(self):
         """ Closes the hydraulic solver freeing all of its allocated memory.
@@ -13659,12 +13959,10 @@ class epanetapi:
         See also  ENinitH, ENrunH, ENnextH
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_closeH(self._ph)
-        else:
-            self.errcode = self._lib.ENcloseH()
+        self.errcode = self._closeH()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENcloseQ(self):
@@ -13675,12 +13973,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___quality.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_closeQ(self._ph)
-        else:
-            self.errcode = self._lib.ENcloseQ()
+        self.errcode = self._closeQ()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENcopyreport(self, filename):
@@ -13694,12 +13990,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_copyreport(self._ph, filename.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENcopyreport(filename.encode("utf-8"))
+        self.errcode = self._copyreport(filename.encode("utf-8"))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENcreateproject(self):
         """ Copies the current contents of a project's report file to another file.
@@ -13710,11 +14004,13 @@ class epanetapi:
         ph	an EPANET project handle that is passed into all other API functions.
 
         """
+        self._cache.clear()
 
         if self._ph is not None:
             self.errcode = self._lib.EN_createproject(byref(self._ph))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENdeletecontrol(self, index):
@@ -13727,13 +14023,12 @@ class epanetapi:
         index       the index of the control to delete (starting from 1).
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deletecontrol(self._ph, int(index))
-        else:
-            self.errcode = self._lib.ENdeletecontrol(int(index))
+        self.errcode = self._deletecontrol(int(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENdeletecurve(self, indexCurve):
         """ Deletes a data curve from a project.
@@ -13745,13 +14040,12 @@ class epanetapi:
         indexCurve  The ID name of the curve to be added.
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deletecurve(self._ph, int(indexCurve))
-        else:
-            self.errcode = self._lib.ENdeletecurve(int(indexCurve))
+        self.errcode = self._deletecurve(int(indexCurve))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENdeletedemand(self, nodeIndex, demandIndex):
         """ Deletes a demand from a junction node.
@@ -13763,13 +14057,12 @@ class epanetapi:
         demandIndex      the position of the demand in the node's demands list (starting from 1).
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deletedemand(self._ph, int(nodeIndex), demandIndex)
-        else:
-            self.errcode = self._lib.ENdeletedemand(int(nodeIndex), demandIndex)
+        self.errcode = self._deletedemand(int(nodeIndex), demandIndex)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENdeletelink(self, indexLink, condition):
         """ Deletes a link from the project.
@@ -13782,13 +14075,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deletelink(self._ph, int(indexLink), condition)
-        else:
-            self.errcode = self._lib.ENdeletelink(int(indexLink), condition)
+        self.errcode = self._deletelink(int(indexLink), condition)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENdeletenode(self, indexNode, condition):
         """ Deletes a node from a project.
@@ -13802,13 +14094,12 @@ class epanetapi:
         See also EN_NodeProperty, NodeType
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___nodes.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deletenode(self._ph, int(indexNode), condition)
-        else:
-            self.errcode = self._lib.ENdeletenode(int(indexNode), condition)
+        self.errcode = self._deletenode(int(indexNode), condition)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENdeletepattern(self, indexPat):
         """ Deletes a time pattern from a project.
@@ -13820,13 +14111,12 @@ class epanetapi:
         indexPat   the time pattern's index (starting from 1).
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deletepattern(self._ph, int(indexPat))
-        else:
-            self.errcode = self._lib.ENdeletepattern(int(indexPat))
+        self.errcode = self._deletepattern(int(indexPat))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENdeleteproject(self):
         """ Deletes an EPANET project.
@@ -13837,11 +14127,13 @@ class epanetapi:
         ph	an EPANET project handle which is returned as NULL.
 
         """
+        self._cache.clear()
 
         if self._ph is not None:
-            self.errcode = self._lib.EN_deleteproject(self._ph)
+            self.errcode = self._deleteproject()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENdeleterule(self, index):
@@ -13854,13 +14146,12 @@ class epanetapi:
         index       the index of the rule to be deleted (starting from 1).
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_deleterule(self._ph, int(index))
-        else:
-            self.errcode = self._lib.ENdeleterule(int(index))
+        self.errcode = self._deleterule(int(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENgetaveragepatternvalue(self, index):
         """ Retrieves the average of all pattern factors in a time pattern.
@@ -13875,14 +14166,11 @@ class epanetapi:
         value The average of all of the time pattern's factors.
         """
 
-        if self._ph is not None:
-            value = c_double()
-            self.errcode = self._lib.EN_getaveragepatternvalue(self._ph, int(index), byref(value))
-        else:
-            value = c_float()
-            self.errcode = self._lib.ENgetaveragepatternvalue(int(index), byref(value))
+        value = self.__real
+        self.errcode = self._getaveragepatternvalue(int(index), byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return value.value
 
     def ENgetbasedemand(self, index, numdemands):
@@ -13899,14 +14187,11 @@ class epanetapi:
         value  the category's base demand.
         """
 
-        if self._ph is not None:
-            bDem = c_double()
-            self.errcode = self._lib.EN_getbasedemand(self._ph, int(index), numdemands, byref(bDem))
-        else:
-            bDem = c_float()
-            self.errcode = self._lib.ENgetbasedemand(int(index), numdemands, byref(bDem))
+        bDem = self.__real
+        self.errcode = self._getbasedemand(int(index), numdemands, byref(bDem))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return bDem.value
 
     def ENgetcomment(self, object_, index):
@@ -13923,14 +14208,12 @@ class epanetapi:
         Returns:
         out_comment  the comment string assigned to the object.
         """
-        out_comment = create_string_buffer(80)
+        out_comment = self.__string_buffer(80)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcomment(self._ph, object_, int(index), byref(out_comment))
-        else:
-            self.errcode = self._lib.ENgetcomment(object_, int(index), byref(out_comment))
+        self.errcode = self._getcomment(object_, int(index), out_comment)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return out_comment.value.decode()
 
     def ENgetcontrol(self, cindex):
@@ -13948,22 +14231,12 @@ class epanetapi:
         nindex  the index of the node used to trigger the control (0 for EN_TIMER and EN_TIMEOFDAY controls).
         level   the action level (tank level, junction pressure, or time in seconds) that triggers the control.
         """
-        ctype = c_int()
-        lindex = c_int()
-        nindex = c_int()
+        ctype, lindex, setting, nindex, level = self.__control
+        self.errcode = self._getcontrol(int(cindex), byref(ctype), byref(lindex),
+                                        byref(setting), byref(nindex), byref(level))
 
-        if self._ph is not None:
-            setting = c_double()
-            level = c_double()
-            self.errcode = self._lib.EN_getcontrol(self._ph, int(cindex), byref(ctype), byref(lindex),
-                                                   byref(setting), byref(nindex), byref(level))
-        else:
-            setting = c_float()
-            level = c_float()
-            self.errcode = self._lib.ENgetcontrol(int(cindex), byref(ctype), byref(lindex),
-                                                  byref(setting), byref(nindex), byref(level))
-
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [ctype.value, lindex.value, setting.value, nindex.value, level.value]
 
     def ENgetcoord(self, index):
@@ -13982,12 +14255,10 @@ class epanetapi:
         x = c_double()
         y = c_double()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcoord(self._ph, int(index), byref(x), byref(y))
-        else:
-            self.errcode = self._lib.ENgetcoord(int(index), byref(x), byref(y))
+        self.errcode = self._getcoord(int(index), byref(x), byref(y))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [x.value, y.value]
 
     def ENgetcount(self, countcode):
@@ -14001,14 +14272,17 @@ class epanetapi:
         Returns:
         count	number of objects of the specified type
         """
-        count = c_int()
+        key = ("count", countcode)
+        if key in self._cache:
+            return self._cache[key]
+        count = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcount(self._ph, countcode, byref(count))
-        else:
-            self.errcode = self._lib.ENgetcount(countcode, byref(count))
+        self.errcode = self._getcount(countcode, byref(count))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = count.value
         return count.value
 
     def ENgetcurve(self, index):
@@ -14026,28 +14300,21 @@ class epanetapi:
 
         See also ENgetcurvevalue
         """
-        out_id = create_string_buffer(self.EN_MAXID)
+        out_id = self.__string_buffer(self.EN_MAXID)
         nPoints = c_int()
-        if self._ph is not None:
-            xValues = (c_double * self.ENgetcurvelen(index))()
-            yValues = (c_double * self.ENgetcurvelen(index))()
-            self.errcode = self._lib.EN_getcurve(self._ph, index, byref(out_id), byref(nPoints),
-                                                 byref(xValues), byref(yValues))
-        else:
-            xValues = (c_float * self.ENgetcurvelen(index))()
-            yValues = (c_float * self.ENgetcurvelen(index))()
-            self.errcode = self._lib.ENgetcurve(index, byref(out_id), byref(nPoints),
-                                                byref(xValues), byref(yValues))
+        values = self._real * self.ENgetcurvelen(index)
+        xValues = values()
+        yValues = values()
+        self.errcode = self._getcurve(index, out_id, byref(nPoints), xValues, yValues)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         curve_attr = {}
         curve_attr['id'] = out_id.value.decode()
         curve_attr['nPoints'] = nPoints.value
-        curve_attr['x'] = []
-        curve_attr['y'] = []
-        for i in range(len(xValues)):
-            curve_attr['x'].append(xValues[i])
-            curve_attr['y'].append(yValues[i])
+        # Converted through a numpy view of each buffer; the lists keep the documented return type
+        curve_attr['x'] = np.frombuffer(xValues, dtype=self._real).tolist()
+        curve_attr['y'] = np.frombuffer(yValues, dtype=self._real).tolist()
         return curve_attr
 
     def ENgetcurveid(self, index):
@@ -14064,15 +14331,19 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___curves.html
         """
-        Id = create_string_buffer(self.EN_MAXID)
+        key = ("curveid", int(index))
+        if key in self._cache:
+            return self._cache[key]
+        Id = self.__string_buffer(self.EN_MAXID)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcurveid(self._ph, int(index), byref(Id))
-        else:
-            self.errcode = self._lib.ENgetcurveid(int(index), byref(Id))
+        self.errcode = self._getcurveid(int(index), Id)
 
-        self.ENgeterror()
-        return Id.value.decode()
+        value = Id.value.decode()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = value
+        return value
 
     def ENgetcurveindex(self, Id):
         """ Retrieves the index of a curve given its ID name.
@@ -14086,14 +14357,17 @@ class epanetapi:
         Returns:
         index   The curve's index (starting from 1).
         """
-        index = c_int()
+        key = ("curveindex", Id)
+        if key in self._cache:
+            return self._cache[key]
+        index = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcurveindex(self._ph, Id.encode("utf-8"), byref(index))
-        else:
-            self.errcode = self._lib.ENgetcurveindex(Id.encode("utf-8"), byref(index))
+        self.errcode = self._getcurveindex(encode_id(Id), byref(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = index.value
         return index.value
 
     def ENgetcurvelen(self, index):
@@ -14108,14 +14382,17 @@ class epanetapi:
         Returns:
         len  The number of data points assigned to the curve.
         """
-        length = c_int()
+        key = ("curvelen", int(index))
+        if key in self._cache:
+            return self._cache[key]
+        length = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcurvelen(self._ph, int(index), byref(length))
-        else:
-            self.errcode = self._lib.ENgetcurvelen(int(index), byref(length))
+        self.errcode = self._getcurvelen(int(index), byref(length))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = length.value
         return length.value
 
     def ENgetcurvetype(self, index):
@@ -14130,14 +14407,12 @@ class epanetapi:
         Returns:
         type_  The curve's type (see EN_CurveType).
         """
-        type_ = c_int()
+        type_ = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getcurvetype(self._ph, int(index), byref(type_))
-        else:
-            self.errcode = self._lib.ENgetcurvetype(int(index), byref(type_))
+        self.errcode = self._getcurvetype(int(index), byref(type_))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return type_.value
 
     def ENgetcurvevalue(self, index, period):
@@ -14154,16 +14429,12 @@ class epanetapi:
         x  the point's x-value.
         y  the point's y-value.
         """
-        if self._ph is not None:
-            x = c_double()
-            y = c_double()
-            self.errcode = self._lib.EN_getcurvevalue(self._ph, int(index), period, byref(x), byref(y))
-        else:
-            x = c_float()
-            y = c_float()
-            self.errcode = self._lib.ENgetcurvevalue(int(index), period, byref(x), byref(y))
+        x = self._real()
+        y = self._real()
+        self.errcode = self._getcurvevalue(int(index), period, byref(x), byref(y))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [x.value, y.value]
 
     def ENgetdemandindex(self, nodeindex, demandName):
@@ -14179,16 +14450,18 @@ class epanetapi:
         Returns:
         demandIndex  the index of the demand being sought.
         """
-        demandIndex = c_int()
+        key = ("demandindex", int(nodeindex), demandName)
+        if key in self._cache:
+            return self._cache[key]
+        demandIndex = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getdemandindex(self._ph, int(nodeindex), demandName.encode('utf-8'),
-                                                       byref(demandIndex))
-        else:
-            self.errcode = self._lib.ENgetdemandindex(int(nodeindex), demandName.encode('utf-8'),
-                                                      byref(demandIndex))
+        self.errcode = self._getdemandindex(int(nodeindex), encode_id(demandName),
+                                            byref(demandIndex))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = demandIndex.value
         return demandIndex.value
 
     def ENgetdemandmodel(self):
@@ -14206,20 +14479,14 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
         Type = c_int()
-        if self._ph is not None:
-            pmin = c_double()
-            preq = c_double()
-            pexp = c_double()
-            self.errcode = self._lib.EN_getdemandmodel(self._ph, byref(Type), byref(pmin),
-                                                       byref(preq), byref(pexp))
-        else:
-            pmin = c_float()
-            preq = c_float()
-            pexp = c_float()
-            self.errcode = self._lib.ENgetdemandmodel(byref(Type), byref(pmin),
-                                                      byref(preq), byref(pexp))
+        pmin = self._real()
+        preq = self._real()
+        pexp = self._real()
+        self.errcode = self._getdemandmodel(byref(Type), byref(pmin),
+                                            byref(preq), byref(pexp))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [Type.value, pmin.value, preq.value, pexp.value]
 
     def ENgetdemandname(self, node_index, demand_index):
@@ -14238,16 +14505,11 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
 
-        if self._ph is not None:
-            demand_name = create_string_buffer(100)
-            self.errcode = self._lib.EN_getdemandname(self._ph, int(node_index), int(demand_index),
-                                                      byref(demand_name))
-        else:
-            demand_name = create_string_buffer(80)
-            self.errcode = self._lib.ENgetdemandname(int(node_index), int(demand_index),
-                                                     byref(demand_name))
+        demand_name = self.__string_buffer(100)
+        self.errcode = self._getdemandname(int(node_index), int(demand_index), demand_name)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return demand_name.value.decode()
 
     def ENgetdemandpattern(self, index, numdemands):
@@ -14264,14 +14526,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
-        patIndex = c_int()
+        patIndex = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getdemandpattern(self._ph, int(index), numdemands, byref(patIndex))
-        else:
-            self.errcode = self._lib.ENgetdemandpattern(int(index), numdemands, byref(patIndex))
+        self.errcode = self._getdemandpattern(int(index), numdemands, byref(patIndex))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return patIndex.value
 
     def ENgetelseaction(self, ruleIndex, actionIndex):
@@ -14292,18 +14552,13 @@ class epanetapi:
         linkIndex = c_int()
         status = c_int()
 
-        if self._ph is not None:
-            setting = c_double()
-            self.errcode = self._lib.EN_getelseaction(self._ph, int(ruleIndex), int(actionIndex),
-                                                      byref(linkIndex),
-                                                      byref(status), byref(setting))
-        else:
-            setting = c_float()
-            self.errcode = self._lib.ENgetelseaction(int(ruleIndex), int(actionIndex),
-                                                     byref(linkIndex),
-                                                     byref(status), byref(setting))
+        setting = self._real()
+        self.errcode = self._getelseaction(int(ruleIndex), int(actionIndex),
+                                           byref(linkIndex),
+                                           byref(status), byref(setting))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [linkIndex.value, status.value, setting.value]
 
     def ENgeterror(self, errcode=0):
@@ -14316,7 +14571,7 @@ class epanetapi:
             if errcode:
                 self.errcode = errcode
             errmssg = create_string_buffer(150)
-            self._lib.ENgeterror(self.errcode, byref(errmssg), 150)
+            self._lib.ENgeterror(self.errcode, errmssg, 150)
             warnings.warn(errmssg.value.decode())
 
     def ENgetflowunits(self):
@@ -14327,14 +14582,12 @@ class epanetapi:
         Returns:
         flowunitsindex a flow units code.
         """
-        flowunitsindex = c_int()
+        flowunitsindex = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getflowunits(self._ph, byref(flowunitsindex))
-        else:
-            self.errcode = self._lib.ENgetflowunits(byref(flowunitsindex))
+        self.errcode = self._getflowunits(byref(flowunitsindex))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return flowunitsindex.value
 
     def ENgetheadcurveindex(self, pumpindex):
@@ -14349,14 +14602,12 @@ class epanetapi:
         Returns:
         value   the index of the curve assigned to the pump's head curve.
         """
-        value = c_long()
+        value = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getheadcurveindex(self._ph, int(pumpindex), byref(value))
-        else:
-            self.errcode = self._lib.ENgetheadcurveindex(int(pumpindex), byref(value))
+        self.errcode = self._getheadcurveindex(int(pumpindex), byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return value.value
 
     def ENgetlinkid(self, index):
@@ -14372,15 +14623,19 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
-        nameID = create_string_buffer(self.EN_MAXID)
+        key = ("linkid", int(index))
+        if key in self._cache:
+            return self._cache[key]
+        nameID = self.__string_buffer(self.EN_MAXID)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getlinkid(self._ph, int(index), byref(nameID))
-        else:
-            self.errcode = self._lib.ENgetlinkid(int(index), byref(nameID))
+        self.errcode = self._getlinkid(int(index), nameID)
 
-        self.ENgeterror()
-        return nameID.value.decode()
+        value = nameID.value.decode()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = value
+        return value
 
     def ENgetlinkindex(self, Id):
         """ Gets the index of a link given its ID name.
@@ -14393,14 +14648,17 @@ class epanetapi:
         Returns:
         index   the link's index (starting from 1).
         """
-        index = c_int()
+        key = ("linkindex", Id)
+        if key in self._cache:
+            return self._cache[key]
+        index = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getlinkindex(self._ph, Id.encode("utf-8"), byref(index))
-        else:
-            self.errcode = self._lib.ENgetlinkindex(Id.encode("utf-8"), byref(index))
+        self.errcode = self._getlinkindex(encode_id(Id), byref(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = index.value
         return index.value
 
     def ENgetlinknodes(self, index):
@@ -14415,15 +14673,18 @@ class epanetapi:
         from   the index of the link's start node (starting from 1).
         to     the index of the link's end node (starting from 1).
         """
+        key = ("linknodes", int(index))
+        if key in self._cache:
+            return list(self._cache[key])
         fromNode = c_int()
         toNode = c_int()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getlinknodes(self._ph, int(index), byref(fromNode), byref(toNode))
-        else:
-            self.errcode = self._lib.ENgetlinknodes(int(index), byref(fromNode), byref(toNode))
+        self.errcode = self._getlinknodes(int(index), byref(fromNode), byref(toNode))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = (fromNode.value, toNode.value)
         return [fromNode.value, toNode.value]
 
     def ENgetlinktype(self, index):
@@ -14437,18 +14698,19 @@ class epanetapi:
         Returns:
         typecode   the link's type (see LinkType).
         """
-        code_p = c_int()
+        key = ("linktype", int(index))
+        if key in self._cache:
+            return self._cache[key]
+        code_p = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getlinktype(self._ph, int(index), byref(code_p))
-        else:
-            self.errcode = self._lib.ENgetlinktype(int(index), byref(code_p))
+        self.errcode = self._getlinktype(int(index), byref(code_p))
 
-        self.ENgeterror()
-        if code_p.value != -1:
-            return code_p.value
+        value = code_p.value if code_p.value != -1 else sys.maxsize
+        if self.errcode:
+            self.ENgeterror()
         else:
-            return sys.maxsize
+            self._cache[key] = value
+        return value
 
     def ENgetlinkvalue(self, index, paramcode):
         """ Retrieves a property value for a link.
@@ -14465,16 +14727,40 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
 
-        if self._ph is not None:
-            fValue = c_double()
-            self.errcode = self._lib.EN_getlinkvalue(self._ph, int(index), paramcode, byref(fValue))
-        else:
-            fValue = c_float()
-            self.errcode = self._lib.ENgetlinkvalue(int(index), paramcode, byref(fValue))
+        fValue = self.__real
+        self.errcode = self._getlinkvalue(int(index), paramcode, byref(fValue))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return fValue.value
 
+    def ENgetlinkvalues(self, paramcode):
+        """ Retrieves a property value for all links.
+
+        ENgetlinkvalues(paramcode)
+
+        Parameters:
+        paramcode   the property to retrieve (see EN_LinkProperty).
+
+        Returns:
+        values  array with the current value of the property for each link.
+
+        Uses a single EN_getlinkvalues call where the library provides it (EPANET 2.3),
+        otherwise one ENgetlinkvalue call per link. Errors differ between the two: the
+        single call reports one error for the whole request, while the per-link calls
+        warn for each link that fails and go on with the rest.
+        """
+        count = self.ENgetcount(ToolkitConstants.EN_LINKCOUNT)
+        getlinkvalues = self.__optional("getlinkvalues")
+        if getlinkvalues is None:
+            return np.fromiter((self.ENgetlinkvalue(i, paramcode) for i in range(1, count + 1)),
+                               dtype=float, count=count)
+        values = (self._real * count)()
+        self.errcode = getlinkvalues(paramcode, values)
+        if self.errcode:
+            self.ENgeterror()
+        return np.frombuffer(values, dtype=self._real).astype(float)
+
     def ENgetnodeid(self, index):
         """ Gets the ID name of a node given its index
 
@@ -14486,15 +14772,19 @@ class epanetapi:
         Returns:
         nameID nodes id
         """
-        nameID = create_string_buffer(self.EN_MAXID)
+        key = ("nodeid", int(index))
+        if key in self._cache:
+            return self._cache[key]
+        nameID = self.__string_buffer(self.EN_MAXID)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getnodeid(self._ph, int(index), byref(nameID))
-        else:
-            self.errcode = self._lib.ENgetnodeid(int(index), byref(nameID))
+        self.errcode = self._getnodeid(int(index), nameID)
 
-        self.ENgeterror()
-        return nameID.value.decode()
+        value = nameID.value.decode()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = value
+        return value
 
     def ENgetnodeindex(self, Id):
         """ Gets the index of a node given its ID name.
@@ -14507,14 +14797,17 @@ class epanetapi:
         Returns:
         index  the node's index (starting from 1).
         """
-        index = c_int()
+        key = ("nodeindex", Id)
+        if key in self._cache:
+            return self._cache[key]
+        index = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getnodeindex(self._ph, Id.encode("utf-8"), byref(index))
-        else:
-            self.errcode = self._lib.ENgetnodeindex(Id.encode("utf-8"), byref(index))
+        self.errcode = self._getnodeindex(encode_id(Id), byref(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = index.value
         return index.value
 
     def ENgetnodetype(self, index):
@@ -14528,14 +14821,17 @@ class epanetapi:
         Returns:
         type the node's type (see NodeType).
         """
-        code_p = c_int()
+        key = ("nodetype", int(index))
+        if key in self._cache:
+            return self._cache[key]
+        code_p = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getnodetype(self._ph, int(index), byref(code_p))
-        else:
-            self.errcode = self._lib.ENgetnodetype(int(index), byref(code_p))
+        self.errcode = self._getnodetype(int(index), byref(code_p))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = code_p.value
         return code_p.value
 
     def ENgetnodevalue(self, index, code_p):
@@ -14552,12 +14848,8 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___nodes.html
         """
-        if self._ph is not None:
-            fValue = c_double()
-            self.errcode = self._lib.EN_getnodevalue(self._ph, int(index), code_p, byref(fValue))
-        else:
-            fValue = c_float()
-            self.errcode = self._lib.ENgetnodevalue(int(index), code_p, byref(fValue))
+        fValue = self.__real
+        self.errcode = self._getnodevalue(int(index), code_p, byref(fValue))
 
         if self.errcode != 240:
             self.ENgeterror()
@@ -14565,6 +14857,34 @@ class epanetapi:
         else:
             return 240
 
+    def ENgetnodevalues(self, code_p):
+        """ Retrieves a property value for all nodes.
+
+        ENgetnodevalues(paramcode)
+
+        Parameters:
+        paramcode  the property to retrieve (see EN_NodeProperty, self.getToolkitConstants).
+
+        Returns:
+        values  array with the current value of the property for each node.
+
+        Uses a single EN_getnodevalues call where the library provides it (EPANET 2.3),
+        otherwise one ENgetnodevalue call per node. Errors differ between the two: the
+        single call reports one error for the whole request, while the per-node calls
+        warn for each node that fails and go on with the rest (a node without a source,
+        error 240, reads as 240 without a warning, as in ENgetnodevalue).
+        """
+        count = self.ENgetcount(ToolkitConstants.EN_NODECOUNT)
+        getnodevalues = self.__optional("getnodevalues")
+        if getnodevalues is None:
+            return np.fromiter((self.ENgetnodevalue(i, code_p) for i in range(1, count + 1)),
+                               dtype=float, count=count)
+        values = (self._real * count)()
+        self.errcode = getnodevalues(code_p, values)
+        if self.errcode:
+            self.ENgeterror()
+        return np.frombuffer(values, dtype=self._real).astype(float)
+
     def ENgetnumdemands(self, index):
         """ Retrieves the number of demand categories for a junction node.
         EPANET 20100
@@ -14577,14 +14897,12 @@ class epanetapi:
         Returns:
         value  the number of demand categories assigned to the node.
         """
-        numDemands = c_int()
+        numDemands = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getnumdemands(self._ph, int(index), byref(numDemands))
-        else:
-            self.errcode = self._lib.ENgetnumdemands(int(index), byref(numDemands))
+        self.errcode = self._getnumdemands(int(index), byref(numDemands))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return numDemands.value
 
     def ENgetoption(self, optioncode):
@@ -14598,14 +14916,11 @@ class epanetapi:
         Returns:
         value the current value of the option.
         """
-        if self._ph is not None:
-            value = c_double()
-            self.errcode = self._lib.EN_getoption(self._ph, optioncode, byref(value))
-        else:
-            value = c_float()
-            self.errcode = self._lib.ENgetoption(optioncode, byref(value))
+        value = self._real()
+        self.errcode = self._getoption(optioncode, byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return value.value
 
     def ENgetpatternid(self, index):
@@ -14621,14 +14936,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___patterns.html
         """
-        nameID = create_string_buffer(self.EN_MAXID)
+        nameID = self.__string_buffer(self.EN_MAXID)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getpatternid(self._ph, int(index), byref(nameID))
-        else:
-            self.errcode = self._lib.ENgetpatternid(int(index), byref(nameID))
+        self.errcode = self._getpatternid(int(index), nameID)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return nameID.value.decode()
 
     def ENgetpatternindex(self, Id):
@@ -14642,14 +14955,17 @@ class epanetapi:
         Returns:
         index   the time pattern's index (starting from 1).
         """
-        index = c_int()
+        key = ("patternindex", Id)
+        if key in self._cache:
+            return self._cache[key]
+        index = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getpatternindex(self._ph, Id.encode("utf-8"), byref(index))
-        else:
-            self.errcode = self._lib.ENgetpatternindex(Id.encode("utf-8"), byref(index))
+        self.errcode = self._getpatternindex(encode_id(Id), byref(index))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = index.value
         return index.value
 
     def ENgetpatternlen(self, index):
@@ -14663,14 +14979,12 @@ class epanetapi:
         Returns:
         leng   the number of time periods in the pattern.
         """
-        leng = c_int()
+        leng = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getpatternlen(self._ph, int(index), byref(leng))
-        else:
-            self.errcode = self._lib.ENgetpatternlen(int(index), byref(leng))
+        self.errcode = self._getpatternlen(int(index), byref(leng))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return leng.value
 
     def ENgetpatternvalue(self, index, period):
@@ -14685,14 +14999,11 @@ class epanetapi:
         Returns:
         value   the pattern factor for the given time period.
         """
-        if self._ph is not None:
-            value = c_double()
-            self.errcode = self._lib.EN_getpatternvalue(self._ph, int(index), period, byref(value))
-        else:
-            value = c_float()
-            self.errcode = self._lib.ENgetpatternvalue(int(index), period, byref(value))
+        value = self.__real
+        self.errcode = self._getpatternvalue(int(index), period, byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return value.value
 
     def ENgetpremise(self, ruleIndex, premiseIndex):
@@ -14721,20 +15032,14 @@ class epanetapi:
         relop = c_int()
         status = c_int()
 
-        if self._ph is not None:
-            value = c_double()
-            self.errcode = self._lib.EN_getpremise(self._ph, int(ruleIndex), int(premiseIndex), byref(logop),
-                                                   byref(object_), byref(objIndex),
-                                                   byref(variable), byref(relop), byref(status),
-                                                   byref(value))
-        else:
-            value = c_float()
-            self.errcode = self._lib.ENgetpremise(int(ruleIndex), int(premiseIndex), byref(logop),
-                                                  byref(object_), byref(objIndex),
-                                                  byref(variable), byref(relop), byref(status),
-                                                  byref(value))
+        value = self._real()
+        self.errcode = self._getpremise(int(ruleIndex), int(premiseIndex), byref(logop),
+                                        byref(object_), byref(objIndex),
+                                        byref(variable), byref(relop), byref(status),
+                                        byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [logop.value, object_.value, objIndex.value, variable.value, relop.value, status.value, value.value]
 
     def ENgetpumptype(self, index):
@@ -14749,14 +15054,12 @@ class epanetapi:
         Returns:
         value   the type of head curve used by the pump (see EN_PumpType).
         """
-        code_p = c_int()
+        code_p = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getpumptype(self._ph, int(index), byref(code_p))
-        else:
-            self.errcode = self._lib.ENgetpumptype(int(index), byref(code_p))
+        self.errcode = self._getpumptype(int(index), byref(code_p))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return code_p.value
 
     def ENgetqualinfo(self):
@@ -14771,18 +15074,15 @@ class epanetapi:
         tracenode 	index of the node being traced (if applicable).
         """
         qualType = c_int()
-        chemname = create_string_buffer(self.EN_MAXID)
-        chemunits = create_string_buffer(self.EN_MAXID)
+        chemname = self.__string_buffer(self.EN_MAXID)
+        chemunits = self.__string_buffer(self.EN_MAXID, 1)
         tracenode = c_int()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getqualinfo(self._ph, byref(qualType), byref(chemname),
-                                                    byref(chemunits), byref(tracenode))
-        else:
-            self.errcode = self._lib.ENgetqualinfo(byref(qualType), byref(chemname),
-                                                   byref(chemunits), byref(tracenode))
+        self.errcode = self._getqualinfo(byref(qualType), chemname,
+                                         chemunits, byref(tracenode))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [qualType.value, chemname.value.decode(), chemunits.value.decode(), tracenode.value]
 
     def ENgetqualtype(self):
@@ -14797,12 +15097,10 @@ class epanetapi:
         qualcode = c_int()
         tracenode = c_int()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getqualtype(self._ph, byref(qualcode), byref(tracenode))
-        else:
-            self.errcode = self._lib.ENgetqualtype(byref(qualcode), byref(tracenode))
+        self.errcode = self._getqualtype(byref(qualcode), byref(tracenode))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [qualcode.value, tracenode.value]
 
     def ENgetresultindex(self, objecttype, index):
@@ -14818,14 +15116,12 @@ class epanetapi:
         Returns:
         value the order in which the element's results were written to file.
         """
-        value = c_int()
+        value = self.__int
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getresultindex(self._ph, objecttype, int(index), byref(value))
-        else:
-            self.errcode = self._lib.ENgetresultindex(objecttype, int(index), byref(value))
+        self.errcode = self._getresultindex(objecttype, int(index), byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return value.value
 
     def ENgetrule(self, index):
@@ -14847,18 +15143,13 @@ class epanetapi:
         nThenActions = c_int()
         nElseActions = c_int()
 
-        if self._ph is not None:
-            priority = c_double()
-            self.errcode = self._lib.EN_getrule(self._ph, int(index), byref(nPremises),
-                                                byref(nThenActions),
-                                                byref(nElseActions), byref(priority))
-        else:
-            priority = c_float()
-            self.errcode = self._lib.ENgetrule(int(index), byref(nPremises),
-                                               byref(nThenActions),
-                                               byref(nElseActions), byref(priority))
+        priority = self._real()
+        self.errcode = self._getrule(int(index), byref(nPremises),
+                                     byref(nThenActions),
+                                     byref(nElseActions), byref(priority))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [nPremises.value, nThenActions.value, nElseActions.value, priority.value]
 
     def ENgetruleID(self, index):
@@ -14875,14 +15166,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___rules.html
         """
-        nameID = create_string_buffer(self.EN_MAXID)
+        nameID = self.__string_buffer(self.EN_MAXID)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getruleID(self._ph, int(index), byref(nameID))
-        else:
-            self.errcode = self._lib.ENgetruleID(int(index), byref(nameID))
+        self.errcode = self._getruleID(int(index), nameID)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return nameID.value.decode()
 
     def ENgetstatistic(self, code):
@@ -14899,14 +15188,11 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___reporting.html
         """
-        if self._ph is not None:
-            value = c_double()
-            self.errcode = self._lib.EN_getstatistic(self._ph, int(code), byref(value))
-        else:
-            value = c_float()
-            self.errcode = self._lib.ENgetstatistic(int(code), byref(value))
+        value = self.__real
+        self.errcode = self._getstatistic(code, byref(value))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return value.value
 
     def ENgetthenaction(self, ruleIndex, actionIndex):
@@ -14926,18 +15212,13 @@ class epanetapi:
         """
         linkIndex = c_int()
         status = c_int()
-        if self._ph is not None:
-            setting = c_double()
-            self.errcode = self._lib.EN_getthenaction(self._ph, int(ruleIndex), int(actionIndex),
-                                                      byref(linkIndex),
-                                                      byref(status), byref(setting))
-        else:
-            setting = c_float()
-            self.errcode = self._lib.ENgetthenaction(int(ruleIndex), int(actionIndex),
-                                                     byref(linkIndex),
-                                                     byref(status), byref(setting))
+        setting = self._real()
+        self.errcode = self._getthenaction(int(ruleIndex), int(actionIndex),
+                                           byref(linkIndex),
+                                           byref(status), byref(setting))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [linkIndex.value, status.value, setting.value]
 
     def ENgettimeparam(self, paramcode):
@@ -14951,14 +15232,12 @@ class epanetapi:
         Returns:
         timevalue the current value of the time parameter (in seconds).
         """
-        timevalue = c_long()
+        timevalue = self.__long
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_gettimeparam(self._ph, c_int(paramcode), byref(timevalue))
-        else:
-            self.errcode = self._lib.ENgettimeparam(c_int(paramcode), byref(timevalue))
+        self.errcode = self._gettimeparam(paramcode, byref(timevalue))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return timevalue.value
 
     def ENgettitle(self):
@@ -14972,19 +15251,20 @@ class epanetapi:
         line2 second title line
         line3 third title line
         """
-        line1 = create_string_buffer(80)
-        line2 = create_string_buffer(80)
-        line3 = create_string_buffer(80)
+        if "title" in self._cache:
+            return list(self._cache["title"])
+        line1 = self.__string_buffer(80)
+        line2 = self.__string_buffer(80, 1)
+        line3 = self.__string_buffer(80, 2)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_gettitle(self._ph, byref(line1), byref(line2),
-                                                 byref(line3))
-        else:
-            self.errcode = self._lib.ENgettitle(byref(line1), byref(line2),
-                                                byref(line3))
+        self.errcode = self._gettitle(line1, line2, line3)
 
-        self.ENgeterror()
-        return [line1.value.decode(), line2.value.decode(), line3.value.decode()]
+        title = (line1.value.decode(), line2.value.decode(), line3.value.decode())
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache["title"] = title
+        return list(title)
 
     def ENgetversion(self):
         """ Retrieves the toolkit API version number.
@@ -14994,9 +15274,14 @@ class epanetapi:
         Returns:
         LibEPANET the version of the OWA-EPANET toolkit.
         """
+        if "version" in self._cache:
+            return self._cache["version"]
         LibEPANET = c_int()
         self.errcode = self._lib.EN_getversion(byref(LibEPANET))
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache["version"] = LibEPANET.value
         return LibEPANET.value
 
     def ENgetvertex(self, index, vertex):
@@ -15015,12 +15300,10 @@ class epanetapi:
         """
         x = c_double()  # need double for EN_ or EN functions.
         y = c_double()
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getvertex(self._ph, int(index), vertex, byref(x), byref(y))
-        else:
-            self.errcode = self._lib.ENgetvertex(int(index), vertex, byref(x), byref(y))
+        self.errcode = self._getvertex(int(index), vertex, byref(x), byref(y))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return [x.value, y.value]
 
     def ENgetvertexcount(self, index):
@@ -15034,14 +15317,17 @@ class epanetapi:
         Returns:
         count  the number of vertex points that describe the link's shape.
         """
+        key = ("vertexcount", int(index))
+        if key in self._cache:
+            return self._cache[key]
         count = c_int()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_getvertexcount(self._ph, int(index), byref(count))
-        else:
-            self.errcode = self._lib.ENgetvertexcount(int(index), byref(count))
+        self.errcode = self._getvertexcount(int(index), byref(count))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
+        else:
+            self._cache[key] = count.value
         return count.value
 
     def ENinit(self, unitsType, headLossType):
@@ -15055,13 +15341,12 @@ class epanetapi:
         headLossType the choice of head loss formula (see EN_HeadLossType).
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_init(self._ph, "", "", unitsType, headLossType)
-        else:
-            self.errcode = self._lib.ENinit("", "", unitsType, headLossType)
+        self.errcode = self._init(b"", b"", unitsType, headLossType)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENinitH(self, flag):
         """ Initializes a network prior to running a hydraulic analysis.
@@ -15075,12 +15360,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_initH(self._ph, flag)
-        else:
-            self.errcode = self._lib.ENinitH(flag)
+        self.errcode = self._initH(flag)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENinitQ(self, saveflag):
@@ -15096,12 +15379,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___quality.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_initQ(self._ph, saveflag)
-        else:
-            self.errcode = self._lib.ENinitQ(saveflag)
+        self.errcode = self._initQ(saveflag)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENnextH(self):
@@ -15115,14 +15396,12 @@ class epanetapi:
         See also  ENrunH
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html
         """
-        tstep = c_long()
+        tstep = self.__long
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_nextH(self._ph, byref(tstep))
-        else:
-            self.errcode = self._lib.ENnextH(byref(tstep))
+        self.errcode = self._nextH(tstep)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return tstep.value
 
     def ENnextQ(self):
@@ -15136,14 +15415,12 @@ class epanetapi:
         See also  ENstepQ, ENrunQ
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___quality.html
         """
-        tstep = c_long()
+        tstep = self.__long
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_nextQ(self._ph, byref(tstep))
-        else:
-            self.errcode = self._lib.ENnextQ(byref(tstep))
+        self.errcode = self._nextQ(tstep)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return tstep.value
 
     def ENopen(self, inpname=None, repname=None, binname=None):
@@ -15158,6 +15435,7 @@ class epanetapi:
 
         See also ENclose
         """
+        self._cache.clear()
         if inpname is None:
             inpname = self.inpfile
         if repname is None:
@@ -15175,11 +15453,10 @@ class epanetapi:
 
         if self._ph is not None:
             self._lib.EN_createproject(byref(self._ph))
-            self.errcode = self._lib.EN_open(self._ph, self.inpfile, self.rptfile, self.binfile)
-        else:
-            self.errcode = self._lib.ENopen(self.inpfile, self.rptfile, self.binfile)
+        self.errcode = self._open(self.inpfile, self.rptfile, self.binfile)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENopenH(self):
@@ -15190,12 +15467,10 @@ class epanetapi:
         See also  ENinitH, ENrunH, ENnextH, ENcloseH
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html"""
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_openH(self._ph)
-        else:
-            self.errcode = self._lib.ENopenH()
+        self.errcode = self._openH()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENopenQ(self):
@@ -15208,12 +15483,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___quality.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_openQ(self._ph)
-        else:
-            self.errcode = self._lib.ENopenQ()
+        self.errcode = self._openQ()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENreport(self):
@@ -15224,12 +15497,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___reporting.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_report(self._ph)
-        else:
-            self.errcode = self._lib.ENreport()
+        self.errcode = self._report()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENresetreport(self):
         """ Resets a project's report options to their default values.
@@ -15239,12 +15510,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___reporting.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_resetreport(self._ph)
-        else:
-            self.errcode = self._lib.ENresetreport()
+        self.errcode = self._resetreport()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENrunH(self):
         """ Computes a hydraulic solution for the current point in time.
@@ -15257,14 +15526,12 @@ class epanetapi:
         See also  ENinitH, ENrunH, ENnextH, ENcloseH
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html
         """
-        t = c_long()
+        t = self.__long
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_runH(self._ph, byref(t))
-        else:
-            self.errcode = self._lib.ENrunH(byref(t))
+        self.errcode = self._runH(t)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return t.value
 
     def ENrunQ(self):
@@ -15278,14 +15545,12 @@ class epanetapi:
         See also  ENopenQ, ENinitQ, ENrunQ, ENnextQ, ENstepQ
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___quality.html
         """
-        t = c_long()
+        t = self.__long
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_runQ(self._ph, byref(t))
-        else:
-            self.errcode = self._lib.ENrunQ(byref(t))
+        self.errcode = self._runQ(t)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return t.value
 
     def ENsaveH(self):
@@ -15296,12 +15561,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_saveH(self._ph)
-        else:
-            self.errcode = self._lib.ENsaveH()
+        self.errcode = self._saveH()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENsavehydfile(self, fname):
@@ -15311,12 +15574,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_savehydfile(self._ph, fname.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsavehydfile(fname.encode("utf-8"))
+        self.errcode = self._savehydfile(fname.encode("utf-8"))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsaveinpfile(self, inpname):
         """ Saves a project's data to an EPANET-formatted text file.
@@ -15325,12 +15586,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_saveinpfile(self._ph, inpname.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsaveinpfile(inpname.encode("utf-8"))
+        self.errcode = self._saveinpfile(inpname.encode("utf-8"))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENsetbasedemand(self, index, demandIdx, value):
@@ -15346,12 +15605,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setbasedemand(self._ph, int(index), demandIdx, c_double(value))
-        else:
-            self.errcode = self._lib.ENsetbasedemand(int(index), demandIdx, c_float(value))
+        self.errcode = self._setbasedemand(int(index), demandIdx, value)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetcomment(self, object_, index, comment):
         """ Sets a comment to a specific index
@@ -15367,12 +15624,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setcomment(self._ph, object_, index, comment.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENsetcomment(object_, index, comment.encode('utf-8'))
+        self.errcode = self._setcomment(object_, index, comment.encode('utf-8'))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetcontrol(self, cindex, ctype, lindex, setting, nindex, level):
         """ Sets the properties of an existing simple control.
@@ -15389,14 +15644,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setcontrol(self._ph, int(cindex), ctype, lindex, c_double(setting),
-                                                   nindex, c_double(level))
-        else:
-            self.errcode = self._lib.ENsetcontrol(int(cindex), ctype, lindex, c_float(setting),
-                                                  nindex, c_float(level))
+        self.errcode = self._setcontrol(int(cindex), ctype, lindex, setting, nindex, level)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetcoord(self, index, x, y):
         """ Sets the (x,y) coordinates of a node.
@@ -15411,12 +15662,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setcoord(self._ph, int(index), c_double(x), c_double(y))
-        else:
-            self.errcode = self._lib.ENsetcoord(int(index), c_double(x), c_double(y))
+        self.errcode = self._setcoord(int(index), x, y)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetcurve(self, index, x, y, nfactors):
         """ Assigns a set of data points to a curve.
@@ -15428,31 +15677,20 @@ class epanetapi:
         index         a curve's index (starting from 1).
         x        	  an array of new x-values for the curve.
         y        	  an array of new y-values for the curve.
-        nfactors      the new number of data points for the curve.
+        nfactors      the new number of data points for the curve; x and y must
+                      each have exactly this many values.
 
         See also ENsetcurvevalue
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___curves.html
         """
-        if nfactors == 1:
+        if np.size(x) != nfactors or np.size(y) != nfactors:
+            raise ValueError(f"Got {np.size(x)} x and {np.size(y)} y values for {nfactors} points.")
+        self._cache.clear()
+        # A single point may be given as scalars; __real_array makes them one-element arrays
+        self.errcode = self._setcurve(int(index), self.__real_array(x), self.__real_array(y), nfactors)
 
-            if self._ph is not None:
-                self.errcode = self._lib.EN_setcurve(self._ph, int(index), (c_double * 1)(x),
-                                                     (c_double * 1)(y), nfactors)
-            else:
-                self.errcode = self._lib.ENsetcurve(int(index), (c_float * 1)(x),
-                                                    (c_float * 1)(y), nfactors)
-
-
-        else:
-
-            if self._ph is not None:
-                self.errcode = self._lib.EN_setcurve(self._ph, int(index), (c_double * nfactors)(*x),
-                                                     (c_double * nfactors)(*y), nfactors)
-            else:
-                self.errcode = self._lib.ENsetcurve(int(index), (c_float * nfactors)(*x),
-                                                    (c_float * nfactors)(*y), nfactors)
-
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetcurveid(self, index, Id):
         """ Changes the ID name of a data curve given its index.
@@ -15466,13 +15704,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___curves.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setcurveid(self._ph, int(index), Id.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENsetcurveid(int(index), Id.encode('utf-8'))
+        self.errcode = self._setcurveid(int(index), encode_id(Id))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetcurvevalue(self, index, pnt, x, y):
         """ Sets the value of a single data point for a curve.
@@ -15487,15 +15724,12 @@ class epanetapi:
         y        	  the point's new y-value.
 
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setcurvevalue(self._ph, int(index), pnt,
-                                                      c_double(x), c_double(y))
-        else:
-            self.errcode = self._lib.ENsetcurvevalue(int(index), pnt,
-                                                     c_float(x), c_float(y))
+        self.errcode = self._setcurvevalue(int(index), pnt, x, y)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetdemandmodel(self, Type, pmin, preq, pexp):
         """ Sets the Type of demand model to use and its parameters.
@@ -15512,14 +15746,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setdemandmodel(self._ph, Type, c_double(pmin),
-                                                       c_double(preq), c_double(pexp))
-        else:
-            self.errcode = self._lib.ENsetdemandmodel(Type, c_float(pmin),
-                                                      c_float(preq), c_float(pexp))
+        self.errcode = self._setdemandmodel(Type, pmin, preq, pexp)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetdemandname(self, node_index, demand_index, demand_name):
         """ Assigns a name to a node's demand category.
@@ -15533,15 +15763,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setdemandname(self._ph, int(node_index), int(demand_index),
-                                                      demand_name.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsetdemandname(int(node_index), int(demand_index),
-                                                     demand_name.encode("utf-8"))
+        self.errcode = self._setdemandname(int(node_index), int(demand_index), encode_id(demand_name))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENsetdemandpattern(self, index, demandIdx, patInd):
@@ -15557,10 +15784,7 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___demands.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setdemandpattern(self._ph, int(index), int(demandIdx), int(patInd))
-        else:
-            self.errcode = self._lib.ENsetdemandpattern(int(index), int(demandIdx), int(patInd))
+        self.errcode = self._setdemandpattern(int(index), int(demandIdx), int(patInd))
 
     def ENsetelseaction(self, ruleIndex, actionIndex, linkIndex, status, setting):
         """ Sets the properties of an ELSE action in a rule-based control.
@@ -15577,16 +15801,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setelseaction(self._ph, int(ruleIndex), int(actionIndex), int(linkIndex),
-                                                      status,
-                                                      c_double(setting))
-        else:
-            self.errcode = self._lib.ENsetelseaction(int(ruleIndex), int(actionIndex), int(linkIndex),
-                                                     status,
-                                                     c_float(setting))
+        self.errcode = self._setelseaction(int(ruleIndex), int(actionIndex), int(linkIndex), status, setting)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetflowunits(self, code):
         """ Sets a project's flow units.
@@ -15598,12 +15816,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setflowunits(self._ph, code)
-        else:
-            self.errcode = self._lib.ENsetflowunits(code)
+        self.errcode = self._setflowunits(code)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetheadcurveindex(self, pumpindex, curveindex):
         """ Assigns a curve to a pump's head curve.
@@ -15616,12 +15832,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setheadcurveindex(self._ph, int(pumpindex), int(curveindex))
-        else:
-            self.errcode = self._lib.ENsetheadcurveindex(int(pumpindex), int(curveindex))
+        self.errcode = self._setheadcurveindex(int(pumpindex), int(curveindex))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetjuncdata(self, index, elev, dmnd, dmndpat):
         """ Sets a group of properties for a junction node.
@@ -15638,14 +15852,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___nodes.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setjuncdata(self._ph, int(index), c_double(elev), c_double(dmnd),
-                                                    dmndpat.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsetjuncdata(int(index), c_float(elev), c_float(dmnd),
-                                                   dmndpat.encode("utf-8"))
+        self.errcode = self._setjuncdata(int(index), elev, dmnd, encode_id(dmndpat))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetlinkid(self, index, newid):
         """ Changes the ID name of a link.
@@ -15659,13 +15869,12 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setlinkid(self._ph, int(index), newid.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsetlinkid(int(index), newid.encode("utf-8"))
+        self.errcode = self._setlinkid(int(index), encode_id(newid))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetlinknodes(self, index, startnode, endnode):
         """ Sets the indexes of a link's start- and end-nodes.
@@ -15678,13 +15887,12 @@ class epanetapi:
         startnode     The index of the link's start node (starting from 1).
         endnode       The index of the link's end node (starting from 1).
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setlinknodes(self._ph, int(index), startnode, endnode)
-        else:
-            self.errcode = self._lib.ENsetlinknodes(int(index), startnode, endnode)
+        self.errcode = self._setlinknodes(int(index), startnode, endnode)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetlinktype(self, indexLink, paramcode, actionCode):
         """ Changes a link's type.
@@ -15699,14 +15907,13 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
+        self._cache.clear()
         indexLink = c_int(indexLink)
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setlinktype(self._ph, byref(indexLink), paramcode, actionCode)
-        else:
-            self.errcode = self._lib.ENsetlinktype(byref(indexLink), paramcode, actionCode)
+        self.errcode = self._setlinktype(byref(indexLink), paramcode, actionCode)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return indexLink.value
 
     def ENsetlinkvalue(self, index, paramcode, value):
@@ -15722,16 +15929,34 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setlinkvalue(self._ph, c_int(index), c_int(paramcode),
-                                                     c_double(value))
-        else:
-            self.errcode = self._lib.ENsetlinkvalue(c_int(index), c_int(paramcode),
-                                                    c_float(value))
+        self.errcode = self._setlinkvalue(int(index), paramcode, value)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
+    def ENsetlinkvalues(self, indices, paramcode, values):
+        """ Sets a property value for a set of links.
+
+        ENsetlinkvalues(indices, paramcode, values)
+
+        Parameters:
+        indices       the links' indices (starting from 1).
+        paramcode     the property to set (see EN_LinkProperty).
+        values        the new value of the property for each link.
+
+        One ENsetlinkvalue call per link through the bound toolkit function; a link whose
+        value is rejected is reported and the rest are still set. Raises ValueError if
+        indices and values differ in length.
+        """
+        if len(indices) != len(values):
+            raise ValueError(f"Got {len(values)} values for {len(indices)} links.")
+        setlinkvalue = self._setlinkvalue
+        for index, value in zip(indices, values):
+            self.errcode = setlinkvalue(int(index), paramcode, value)
+            if self.errcode:
+                self.ENgeterror()
+
     def ENsetnodeid(self, index, newid):
         """ Changes the ID name of a node.
 
@@ -15744,12 +15969,11 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___nodes.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setnodeid(self._ph, int(index), newid.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENsetnodeid(int(index), newid.encode('utf-8'))
-        self.ENgeterror()
+        self.errcode = self._setnodeid(int(index), encode_id(newid))
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetnodevalue(self, index, paramcode, value):
         """ Sets a property value for a node.
@@ -15765,15 +15989,33 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___nodes.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setnodevalue(self._ph, c_int(index), c_int(paramcode),
-                                                     c_double(value))
-        else:
-            self.errcode = self._lib.ENsetnodevalue(c_int(index), c_int(paramcode),
-                                                    c_float(value))
-        self.ENgeterror()
+        self.errcode = self._setnodevalue(int(index), paramcode, value)
+        if self.errcode:
+            self.ENgeterror()
         return
 
+    def ENsetnodevalues(self, indices, paramcode, values):
+        """ Sets a property value for a set of nodes.
+
+        ENsetnodevalues(indices, paramcode, values)
+
+        Parameters:
+        indices    the nodes' indices (starting from 1).
+        paramcode  the property to set (see EN_NodeProperty, self.getToolkitConstants).
+        values     the new value of the property for each node.
+
+        One ENsetnodevalue call per node through the bound toolkit function; a node whose
+        value is rejected is reported and the rest are still set. Raises ValueError if
+        indices and values differ in length.
+        """
+        if len(indices) != len(values):
+            raise ValueError(f"Got {len(values)} values for {len(indices)} nodes.")
+        setnodevalue = self._setnodevalue
+        for index, value in zip(indices, values):
+            self.errcode = setnodevalue(int(index), paramcode, value)
+            if self.errcode:
+                self.ENgeterror()
+
     def ENsetoption(self, optioncode, value):
         """ Sets the value for an anlysis option.
 
@@ -15784,11 +16026,9 @@ class epanetapi:
         value        the new value assigned to the option.
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setoption(self._ph, optioncode, c_double(value))
-        else:
-            self.errcode = self._lib.ENsetoption(optioncode, c_float(value))
-        self.ENgeterror()
+        self.errcode = self._setoption(optioncode, value)
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpattern(self, index, factors, nfactors):
         """ Sets the pattern factors for a given time pattern.
@@ -15803,12 +16043,9 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___patterns.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpattern(self._ph, int(index), (c_double * nfactors)(*factors), nfactors)
-        else:
-            self.errcode = self._lib.ENsetpattern(int(index), (c_float * nfactors)(*factors),
-                                                  nfactors)
-        self.ENgeterror()
+        self.errcode = self._setpattern(int(index), self.__real_array(factors, size=nfactors), nfactors)
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpatternid(self, index, Id):
         """ Changes the ID name of a time pattern given its index.
@@ -15822,12 +16059,11 @@ class epanetapi:
 
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___patterns.html
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpatternid(self._ph, int(index), Id.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENsetpatternid(int(index), Id.encode('utf-8'))
-        self.ENgeterror()
+        self.errcode = self._setpatternid(int(index), encode_id(Id))
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpatternvalue(self, index, period, value):
         """ Sets a time pattern's factor for a given time period.
@@ -15840,11 +16076,9 @@ class epanetapi:
         value      the new value of the pattern factor for the given time period.
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpatternvalue(self._ph, int(index), period, c_double(value))
-        else:
-            self.errcode = self._lib.ENsetpatternvalue(int(index), period, c_float(value))
-        self.ENgeterror()
+        self.errcode = self._setpatternvalue(int(index), period, value)
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpipedata(self, index, length, diam, rough, mloss):
         """ Sets a group of properties for a pipe link.
@@ -15862,16 +16096,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___links.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpipedata(self._ph, int(index), c_double(length),
-                                                    c_double(diam), c_double(rough),
-                                                    c_double(mloss))
-        else:
-            self.errcode = self._lib.ENsetpipedata(int(index), c_float(length),
-                                                   c_float(diam), c_float(rough),
-                                                   c_float(mloss))
+        self.errcode = self._setpipedata(int(index), length, diam, rough, mloss)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpremise(self, ruleIndex, premiseIndex, logop, object_, objIndex, variable, relop, status, value):
         """ Sets the properties of a premise in a rule-based control.
@@ -15893,14 +16121,11 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___rules.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpremise(self._ph, int(ruleIndex), int(premiseIndex), logop, object_,
-                                                   objIndex, variable, relop, status, c_double(value))
-        else:
-            self.errcode = self._lib.ENsetpremise(int(ruleIndex), int(premiseIndex), logop, object_,
-                                                  objIndex, variable, relop, status, c_float(value))
+        self.errcode = self._setpremise(int(ruleIndex), int(premiseIndex), logop, object_,
+                                        objIndex, variable, relop, status, value)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpremiseindex(self, ruleIndex, premiseIndex, objIndex):
         """ Sets the index of an object in a premise of a rule-based control.
@@ -15914,12 +16139,10 @@ class epanetapi:
         objIndex      the index of the object (e.g. the index of a tank).
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpremiseindex(self._ph, int(ruleIndex), int(premiseIndex), objIndex)
-        else:
-            self.errcode = self._lib.ENsetpremiseindex(int(ruleIndex), int(premiseIndex), objIndex)
+        self.errcode = self._setpremiseindex(int(ruleIndex), int(premiseIndex), objIndex)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpremisestatus(self, ruleIndex, premiseIndex, status):
         """ Sets the status being compared to in a premise of a rule-based control.
@@ -15933,12 +16156,10 @@ class epanetapi:
         status        the status that the premise's object status is compared to (see RULESTATUS).
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpremisestatus(self._ph, int(ruleIndex), int(premiseIndex), status)
-        else:
-            self.errcode = self._lib.ENsetpremisestatus(int(ruleIndex), int(premiseIndex), status)
+        self.errcode = self._setpremisestatus(int(ruleIndex), int(premiseIndex), status)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetpremisevalue(self, ruleIndex, premiseIndex, value):
         """ Sets the value in a premise of a rule-based control.
@@ -15952,12 +16173,10 @@ class epanetapi:
         value         The value that the premise's variable is compared to.
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setpremisevalue(self._ph, int(ruleIndex), premiseIndex, c_double(value))
-        else:
-            self.errcode = self._lib.ENsetpremisevalue(int(ruleIndex), premiseIndex, c_float(value))
+        self.errcode = self._setpremisevalue(int(ruleIndex), premiseIndex, value)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetqualtype(self, qualcode, chemname, chemunits, tracenode):
         """ Sets the type of water quality analysis to run.
@@ -15973,14 +16192,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___options.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setqualtype(self._ph, qualcode, chemname.encode("utf-8"),
-                                                    chemunits.encode("utf-8"), tracenode.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsetqualtype(qualcode, chemname.encode("utf-8"),
-                                                   chemunits.encode("utf-8"), tracenode.encode("utf-8"))
+        self.errcode = self._setqualtype(qualcode, encode_id(chemname), encode_id(chemunits), encode_id(tracenode))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENsetreport(self, command):
@@ -15994,12 +16209,10 @@ class epanetapi:
         See also ENreport
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setreport(self._ph, command.encode("utf-8"))
-        else:
-            self.errcode = self._lib.ENsetreport(command.encode("utf-8"))
+        self.errcode = self._setreport(command.encode("utf-8"))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetrulepriority(self, ruleIndex, priority):
         """ Sets the priority of a rule-based control.
@@ -16012,12 +16225,10 @@ class epanetapi:
         priority      the priority value assigned to the rule.
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setrulepriority(self._ph, int(ruleIndex), c_double(priority))
-        else:
-            self.errcode = self._lib.ENsetrulepriority(int(ruleIndex), c_float(priority))
+        self.errcode = self._setrulepriority(int(ruleIndex), priority)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetstatusreport(self, statuslevel):
         """ Sets the level of hydraulic status reporting.
@@ -16031,12 +16242,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___reporting.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setstatusreport(self._ph, statuslevel)
-        else:
-            self.errcode = self._lib.ENsetstatusreport(statuslevel)
+        self.errcode = self._setstatusreport(statuslevel)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsettankdata(self, index, elev, initlvl, minlvl, maxlvl, diam, minvol, volcurve):
         """ Sets a group of properties for a tank node.
@@ -16057,16 +16266,11 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___nodes.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_settankdata(
-                self._ph, index, c_double(elev), c_double(initlvl), c_double(minlvl),
-                c_double(maxlvl), c_double(diam), c_double(minvol), volcurve.encode('utf-8'))
-        else:
-            self.errcode = self._lib.ENsettankdata(index, c_float(elev), c_float(initlvl), c_float(minlvl),
-                                                   c_float(maxlvl), c_float(diam), c_float(minvol),
-                                                   volcurve.encode('utf-8'))
+        self.errcode = self._settankdata(int(index), elev, initlvl, minlvl, maxlvl, diam, minvol,
+                                         encode_id(volcurve))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetthenaction(self, ruleIndex, actionIndex, linkIndex, status, setting):
         """ Sets the properties of a THEN action in a rule-based control.
@@ -16083,16 +16287,10 @@ class epanetapi:
 
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setthenaction(self._ph, int(ruleIndex), int(actionIndex), int(linkIndex),
-                                                      status,
-                                                      c_double(setting))
-        else:
-            self.errcode = self._lib.ENsetthenaction(int(ruleIndex), int(actionIndex), int(linkIndex),
-                                                     status,
-                                                     c_float(setting))
+        self.errcode = self._setthenaction(int(ruleIndex), int(actionIndex), int(linkIndex), status, setting)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsettimeparam(self, paramcode, timevalue):
         """ Sets the value of a time parameter.
@@ -16105,12 +16303,10 @@ class epanetapi:
         """
         self.solve = 0
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_settimeparam(self._ph, c_int(paramcode), c_long(int(timevalue)))
-        else:
-            self.errcode = self._lib.ENsettimeparam(c_int(paramcode), c_long(int(timevalue)))
+        self.errcode = self._settimeparam(paramcode, int(timevalue))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsettitle(self, line1, line2, line3):
         """ Sets the title lines of the project.
@@ -16123,16 +16319,12 @@ class epanetapi:
         line2   second title line
         line3   third title line
         """
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_settitle(self._ph, line1.encode("utf-8"), line2.encode("utf-8"),
-                                                 line3.encode("utf-8"))
-
-        else:
-            self.errcode = self._lib.ENsettitle(line1.encode("utf-8"), line2.encode("utf-8"),
-                                                line3.encode("utf-8"))
+        self.errcode = self._settitle(line1.encode("utf-8"), line2.encode("utf-8"), line3.encode("utf-8"))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsetvertices(self, index, x, y, vertex):
         """ Assigns a set of internal vertex points to a link.
@@ -16144,18 +16336,18 @@ class epanetapi:
         index      a link's index (starting from 1).
         x          an array of X-coordinates for the vertex points.
         y          an array of Y-coordinates for the vertex points.
-        vertex     the number of vertex points being assigned.
+        vertex     the number of vertex points being assigned; x and y must each have
+                   exactly this many values.
         """
+        if np.size(x) != vertex or np.size(y) != vertex:
+            raise ValueError(f"Got {np.size(x)} x and {np.size(y)} y values for {vertex} vertices.")
+        self._cache.clear()
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_setvertices(self._ph, int(index), (c_double * vertex)(*x),
-                                                    (c_double * vertex)(*y), vertex)
-
-        else:
-            self.errcode = self._lib.ENsetvertices(int(index), (c_double * vertex)(*x),
-                                                   (c_double * vertex)(*y), vertex)
+        self.errcode = self._setvertices(int(index), self.__real_array(x, c_double),
+                                         self.__real_array(y, c_double), vertex)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
 
     def ENsolveH(self):
         """ Runs a complete hydraulic simulation with results for all time periods
@@ -16167,13 +16359,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_solveH(self._ph)
-
-        else:
-            self.errcode = self._lib.ENsolveH()
+        self.errcode = self._solveH()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENsolveQ(self):
@@ -16185,13 +16374,10 @@ class epanetapi:
         See also ENopenQ, ENinitQ, ENrunQ, ENnextQ, ENcloseQ
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html"""
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_solveQ(self._ph)
-
-        else:
-            self.errcode = self._lib.ENsolveQ()
+        self.errcode = self._solveQ()
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENstepQ(self):
@@ -16205,15 +16391,12 @@ class epanetapi:
         See also ENrunQ, ENnextQ
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html
         """
-        tleft = c_long()
+        tleft = self.__long
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_stepQ(self._ph, byref(tleft))
-
-        else:
-            self.errcode = self._lib.ENstepQ(byref(tleft))
+        self.errcode = self._stepQ(tleft)
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return tleft.value
 
     def ENusehydfile(self, hydfname):
@@ -16227,13 +16410,10 @@ class epanetapi:
         OWA-EPANET Toolkit: http://wateranalytics.org/EPANET/group___hydraulics.html
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_usehydfile(self._ph, hydfname.encode("utf-8"))
-
-        else:
-            self.errcode = self._lib.ENusehydfile(hydfname.encode("utf-8"))
+        self.errcode = self._usehydfile(hydfname.encode("utf-8"))
 
-        self.ENgeterror()
+        if self.errcode:
+            self.ENgeterror()
         return
 
     def ENwriteline(self, line):
@@ -16245,13 +16425,37 @@ class epanetapi:
         line         a text string to write.
         """
 
-        if self._ph is not None:
-            self.errcode = self._lib.EN_writeline(self._ph, line.encode("utf-8"))
+        self.errcode = self._writeline(line.encode("utf-8"))
+
+        if self.errcode:
+            self.ENgeterror()
 
-        else:
-            self.errcode = self._lib.ENwriteline(line.encode("utf-8"))
 
-        self.ENgeterror()
+# EPANET-MSX libraries loaded so far, by absolute path
+MSX_LIBRARIES = {}
+
+
+def load_msx_library(path):
+    """ Loads the EPANET-MSX library at path, once per process and path.
+
+    Argument types are declared when the library is first loaded. They cover the
+    functions called per element or per time step, so ctypes converts plain
+    Python/numpy numbers itself."""
+    key = os.path.abspath(path)
+    lib = MSX_LIBRARIES.get(key)
+    if lib is None:
+        lib = cdll.LoadLibrary(path)
+        lib.MSXgeterror.argtypes = [c_int, c_char_p, c_int]
+        lib.MSXgetqual.argtypes = [c_int, c_int, c_int, POINTER(c_double)]
+        lib.MSXgetinitqual.argtypes = [c_int, c_int, c_int, POINTER(c_double)]
+        lib.MSXsetconstant.argtypes = [c_int, c_double]
+        lib.MSXsetparameter.argtypes = [c_int, c_int, c_int, c_double]
+        lib.MSXsetinitqual.argtypes = [c_int, c_int, c_int, c_double]
+        lib.MSXsetpattern.argtypes = [c_int, POINTER(c_double), c_int]
+        lib.MSXsetpatternvalue.argtypes = [c_int, c_int, c_double]
+        lib.MSXsetsource.argtypes = [c_int, c_int, c_int, c_double, c_int]
+        MSX_LIBRARIES[key] = lib
+    return lib
 
 
 class epanetmsxapi:
@@ -16261,31 +16465,37 @@ class epanetmsxapi:
                  msxrealfile=''):
         self.display_msg = display_msg
         self.customMSXlib = customMSXlib
+        self.__buffers = {}
+        # Out-parameters shared by the scalar getters; read back before returning
+        self.__int = c_int()
+        self.__double = c_double()
         if customMSXlib is not None:
             self.MSXLibEPANET = customMSXlib
             loadlib = False
-            self.msx_lib = cdll.LoadLibrary(self.MSXLibEPANET)
+            self.msx_lib = load_msx_library(self.MSXLibEPANET)
             self.MSXLibEPANETPath = os.path.dirname(self.MSXLibEPANET)
             self.msx_error = self.msx_lib.MSXgeterror
-            self.msx_error.argtypes = [c_int, c_char_p, c_int]
         if loadlib:
-            ops = platform.system().lower()
-            if ops in ["windows"]:
-                self.MSXLibEPANET = resource_filename("epyt", os.path.join("libraries", "win", "epanetmsx.dll"))
-            elif ops in ["darwin"]:
-                self.MSXLibEPANET = resource_filename("epyt", os.path.join("libraries", "mac", "epanetmsx.dylib"))
-            else:
-                self.MSXLibEPANET = resource_filename("epyt", os.path.join("libraries", "glnx", "epanetmsx.so"))
-
-            self.msx_lib = cdll.LoadLibrary(self.MSXLibEPANET)
+            self.MSXLibEPANET = MSX_LIBRARY
+            self.msx_lib = load_msx_library(self.MSXLibEPANET)
             self.MSXLibEPANETPath = os.path.dirname(self.MSXLibEPANET)
 
             self.msx_error = self.msx_lib.MSXgeterror
-            self.msx_error.argtypes = [c_int, c_char_p, c_int]
 
         if not ignore_msxfile:
             self.MSXopen(msxfile, msxrealfile)
 
+    def __string_buffer(self, size, slot=0):
+        """ Returns a reusable, emptied char buffer of the given size. Callers must copy
+            the contents out (e.g. with .value.decode()) before the next call, and use a
+            different slot for each buffer they need at the same time."""
+        buffer = self.__buffers.get((size, slot))
+        if buffer is None:
+            buffer = self.__buffers[size, slot] = create_string_buffer(size)
+        else:
+            buffer[0] = b'\x00'
+        return buffer
+
     def MSXopen(self, msxfile, msxrealfile):
         """
         Open MSX file
@@ -16323,7 +16533,8 @@ class epanetmsxapi:
 
     def MSXerror(self, err_code):
         """ Function that every other function uses in case of an error """
-        errmsg = create_string_buffer(256)
+        # Own slot, so an error lookup never overwrites a buffer the caller holds
+        errmsg = self.__string_buffer(256, 1)
         self.msx_error(err_code, errmsg, 256)
         print(errmsg.value.decode())
 
@@ -16343,9 +16554,8 @@ class epanetmsxapi:
           Returns:
               The index number (starting from 1) of object of that type with that specific name."""
         obj_type = c_int(obj_type)
-        # obj_id=c_char_p(obj_id)
         index = c_int()
-        err = self.msx_lib.MSXgetindex(obj_type, obj_id.encode("utf-8"), byref(index))
+        err = self.msx_lib.MSXgetindex(obj_type, encode_id(obj_id), byref(index))
         if err != 0:
             Warning(self.MSXerror(err))
         return index.value
@@ -16372,7 +16582,7 @@ class epanetmsxapi:
                 Returns:
                     id object's ID name"""
 
-        obj_id = create_string_buffer(id_len + 1)
+        obj_id = self.__string_buffer(id_len + 1)
         err = self.msx_lib.MSXgetID(obj_type, index, obj_id, id_len)
         if err != 0:
             Warning(self.MSXerror(err))
@@ -16397,7 +16607,7 @@ class epanetmsxapi:
             Returns : the number of characters in the ID name of MSX object
 
             """
-        len = c_int()
+        len = self.__int
         err = self.msx_lib.MSXgetIDlen(obj_type, index, byref(len))
         if err:
             Warning(self.MSXerror(err))
@@ -16419,7 +16629,7 @@ class epanetmsxapi:
                 atol : the absolute concentration tolerance defined for the species.
                 rtol : the relative concentration tolerance defined for the species.  """
         type = c_int()
-        units = create_string_buffer(16)
+        units = self.__string_buffer(16)
         atol = c_double()
         rtol = c_double()
 
@@ -16449,7 +16659,7 @@ class epanetmsxapi:
             Returns:
                 The count number of object of that type.
          """
-        count = c_int()
+        count = self.__int
         err = self.msx_lib.MSXgetcount(code, byref(count))
         if err:
             Warning(self.MSXerror(err))
@@ -16465,7 +16675,7 @@ class epanetmsxapi:
                 appeared in the MSX input file
 
         Returns: value -> the value assigned to the constant.    """
-        value = c_double()
+        value = self.__double
         err = self.msx_lib.MSXgetconstant(index, byref(value))
         if err:
             Warning(self.MSXerror(err))
@@ -16490,7 +16700,7 @@ class epanetmsxapi:
                Returns:
                    value : the value assigned to the parameter for the node or link
                            of interest.        """
-        value = c_double()
+        value = self.__double
         err = self.msx_lib.MSXgetparameter(obj_type, index, param, byref(value))
         if err:
             Warning(self.MSXerror(err))
@@ -16508,7 +16718,7 @@ class epanetmsxapi:
         Returns:
              len:   the number of time periods (and therefore number of multipliers)
                    that appear in the pattern."""
-        len = c_int()
+        len = self.__int
         err = self.msx_lib.MSXgetpatternlen(pattern_index, byref(len))
         if err:
             Warning(self.MSXerror(err))
@@ -16525,7 +16735,7 @@ class epanetmsxapi:
 
                  period: the index of the time period (starting from 1) whose
                  multiplier is being sought """
-        value = c_double()
+        value = self.__double
         err = self.msx_lib.MSXgetpatternvalue(pattern_index, period, byref(value))
         if err:
             Warning(self.MSXerror(err))
@@ -16550,11 +16760,8 @@ class epanetmsxapi:
                  Returns:
                         value: the initial concetration of the species at the node or
                                link of interest."""
-        value = c_double()
-        obj_type = c_int(obj_type)
-        species = c_int(species)
-        index = c_int(index)
-        err = self.msx_lib.MSXgetinitqual(obj_type, index, species, byref(value))
+        value = self.__double
+        err = self.msx_lib.MSXgetinitqual(obj_type, index, species, value)
         if err:
             Warning(self.MSXerror(err))
         return value.value
@@ -16646,7 +16853,6 @@ class epanetmsxapi:
 
              Value: float -> the new value to be assigned to the constant."""
 
-        value = c_double(value)
         err = self.msx_lib.MSXsetconstant(index, value)
         if err:
             Warning(self.MSXerror(err))
@@ -16669,7 +16875,6 @@ class epanetmsxapi:
 
                value: the value to be assigned to the parameter for the node or
                       link of interest.                 """
-        value = c_double(value)
         err = self.msx_lib.MSXsetparameter(obj_type, index, param, value)
         if err:
             Warning(self.MSXerror(err))
@@ -16693,7 +16898,6 @@ class epanetmsxapi:
                         of interest.
                  """
 
-        value = c_double(value)
         err = self.msx_lib.MSXsetinitqual(obj_type, index, species, value)
         if err:
             Warning(self.MSXerror(err))
@@ -16708,12 +16912,11 @@ class epanetmsxapi:
                 factors: an array of multiplier values to replace those previously used by
                          the pattern
                 nfactors: the number of entries in the multiplier array/ vector factors"""
-        if isinstance(index, int):
-            index = c_int(index)
-        nfactors = c_int(nfactors)
-        DoubleArray = c_double * len(factors)
-        mult_array = DoubleArray(*factors)
-        err = self.msx_lib.MSXsetpattern(index, mult_array, nfactors)
+        factors = np.ascontiguousarray(factors, dtype=c_double)
+        if factors.size < nfactors:
+            # The library would read past the end of the array
+            raise ValueError(f"Got {factors.size} factors, expected at least {nfactors}.")
+        err = self.msx_lib.MSXsetpattern(int(index), factors.ctypes.data_as(POINTER(c_double)), nfactors)
         if err:
             Warning(self.MSXerror(err))
 
@@ -16728,7 +16931,6 @@ class epanetmsxapi:
 
                period: the time period (starting from 1) in the pattern to be replaced
                value:  the new multiplier value to use for that time period."""
-        value = c_double(value)
         err = self.msx_lib.MSXsetpatternvalue(pattern, period, value)
         if err:
             Warning(self.MSXerror(err))
@@ -16773,12 +16975,8 @@ class epanetmsxapi:
                t : current simulation time at the end of the step(in secconds)
                tleft: time left in the simulation (in secconds)
            """
-        if platform.system().lower() in ["windows"]:
-            t = c_double()
-            tleft = c_double()
-        else:
-            t = c_double()
-            tleft = c_long()
+        t = c_double()
+        tleft = MSX_TLEFT_TYPE()
         err = self.msx_lib.MSXstep(byref(t), byref(tleft))
 
         if err:
@@ -16829,9 +17027,8 @@ class epanetmsxapi:
                time period.
         """
 
-        value = 0
-        value = c_double(value)
-        err = self.msx_lib.MSXgetqual(type, index, species, byref(value))
+        value = self.__double
+        err = self.msx_lib.MSXgetqual(type, index, species, value)
         if err:
             Warning(self.MSXerror(err))
         return value.value
@@ -16860,10 +17057,6 @@ class epanetmsxapi:
 
                 pat: the index of the time pattern used to add variability to the
                      source's baseline level ( use 0 if the source has a constant strength)     """
-        level = c_double(level)
-
-        pat = c_int(pat)
-        type = c_int(type)
         err = self.msx_lib.MSXsetsource(node, species, type, level, pat)
         if err:
             Warning(self.MSXerror(err))
@@ -16877,7 +17070,7 @@ class epanetmsxapi:
 
         Returns:
             errmsg: the text of the error message corresponding to the error code"""
-        errmsg = create_string_buffer(80)
+        errmsg = self.__string_buffer(80, 1)
         e = self.msx_lib.MSXgeterror(err, errmsg, 80)
 
         if e:
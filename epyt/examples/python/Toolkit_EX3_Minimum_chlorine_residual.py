@@ -26,9 +26,6 @@ d.setTimeSimulationDuration(6 * 24 * 3600)
 # Obtain a hydraulic solution 
 d.solveCompleteHydraulics()
 
-# Get the number of nodes
-nnodes = d.getNodeCount()
-
 # Get source node's index
 sourceindex = d.getNodeIndex(SourceID)
 
@@ -51,11 +48,10 @@ while not violation and (csource <= 4.0):
     while not violation and (tstep > 0):
         t = d.runQualityAnalysis()
         if t > 432000:
-            for i in range(nnodes):
-                c = d.getNodeActualQuality(i + 1)
-                if c < Ctarget:
-                    violation = 1
-                    break
+            # Fetch all node qualities at once and check them together
+            c = d.getNodeActualQuality()
+            if (c < Ctarget).any():
+                violation = 1
         tstep = d.nextQualityAnalysisStep()
 
 print('csourse = ' + str(csource))
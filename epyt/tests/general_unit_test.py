@@ -1,5 +1,9 @@
 from math import isclose
-from epyt import epanet
+from epyt import epanet, networks
+from epyt.epanet import NetworkFiles
+import os
+import shutil
+import tempfile
 import numpy as np
 import unittest
 
@@ -613,6 +617,12 @@ class GetTest(unittest.TestCase):
                               'NodeID': '2', 'Value': 110.0,
                               'Control': 'LINK 9 OPEN IF NODE 2 BELOW 110.0'})
 
+    def test_getLibFunctions(self):
+        err_msg = 'Wrong library functions output'
+        for functions in (self.epanetClass.getLibFunctions(), self.epanetClass.getENfunctionsImpemented()):
+            self.assertIn('ENgetcount', functions, err_msg)
+            self.assertEqual([f for f in functions if f.startswith('_')], [], err_msg)
+
     def test_getCurveComment(self):
         d = epanet('Net3.inp', ph=False)
         self.assertEqual(d.getCurveComment([1, 2]),
@@ -1357,6 +1367,23 @@ class SetTest(unittest.TestCase):
         self.assertAlmostEqual(d.getCurvesInfo().CurveXvalue[curve_index - 1][0], x_y_values[0], err_msg)
         self.assertEqual(d.getCurvesInfo().CurveYvalue[curve_index - 1][0], x_y_values[1], err_msg)
 
+    def test_setCurveSinglePoint(self):
+        d = self.epanetClass
+        err_msg = 'Wrong Curve Value Output'
+        # A single point given as a list of [x, y] pairs or as one [x, y] pair
+        for point in ([[1200, 180]], [1300, 170]):
+            d.setCurve(1, point)
+            x, y = point[0] if len(point) == 1 else point
+            self.assertEqual(d.getCurveLengths(1), 1, 'Wrong Curve Length Output')
+            self.assertEqual(d.getCurvesInfo().CurveXvalue[0], [x], err_msg)
+            self.assertEqual(d.getCurvesInfo().CurveYvalue[0], [y], err_msg)
+            np.testing.assert_array_equal(d.getCurveValue(1, 1), [x, y], err_msg=err_msg)
+        # x and y must hold exactly nfactors points
+        for x, y, nfactors in (([1.0, 2.0], [3.0, 4.0], 5), ([1.0, 2.0], [3.0], 2), ([1.0, 2.0], [3.0, 4.0], 1)):
+            with self.assertRaises(ValueError):
+                d.api.ENsetcurve(1, x, y, nfactors)
+        self.assertEqual(d.getCurveValue(1), {1: [[1300.0, 170.0]]}, 'Curve changed')
+
     def test_setDemandModel(self):
         model_type = 'PDA'
         pmin = 0
@@ -2177,6 +2204,16 @@ class SetTest(unittest.TestCase):
         self.epanetClass.setPatternValue(pattern_index, pattern_time_step, pattern_factor)
         self.assertEqual(self.epanetClass.getPattern()[1][pattern_time_step - 1], pattern_factor, err_msg)
 
+    def test_setPatternShortFactors(self):
+        # Fewer factors than nfactors would have the toolkit read past the array
+        d = self.epanetClass
+        factors = d.getPattern()[0].tolist()
+        with self.assertRaises(ValueError):
+            d.api.ENsetpattern(1, [1.0, 2.0], 6)
+        with self.assertRaises(ValueError):
+            d.api.ENsetcurve(1, [1000.0], [200.0], 3)
+        np.testing.assert_array_equal(d.getPattern()[0], factors, err_msg='Pattern changed')
+
     def test_setRule(self):
         d = epanet('BWSN_Network_1.inp', ph=False)
 
@@ -2298,6 +2335,34 @@ class SetTest(unittest.TestCase):
         self.epanetClass.setTimeStatisticsType(statistics_type)
         self.assertEqual(self.epanetClass.getTimeStatisticsType(), statistics_type, err_msg)
 
+    def test_setWholeNetwork(self):
+        # The legacy project from setUp, then a project-handle one
+        for ph in (False, True):
+            with self.subTest(ph=ph):
+                d = epanet('Net1.inp', ph=True) if ph else self.epanetClass
+                err_msg = 'Error setting values for the whole network'
+                diameters = np.arange(1, d.getLinkCount() + 1) * 2.0
+                # The pump (last link) rejects a diameter; the pipes are still set
+                d.setLinkDiameter(diameters)
+                np.testing.assert_array_almost_equal(d.getLinkDiameter(), np.append(diameters[:-1], 0),
+                                                     err_msg=err_msg)
+                # NaN leaves a node's elevation unchanged
+                elevations = d.getNodeElevations()
+                new_elevations = elevations + 10
+                new_elevations[[0, 3]] = np.nan
+                d.setNodeElevations(new_elevations)
+                expected = elevations + 10
+                expected[[0, 3]] = elevations[[0, 3]]
+                np.testing.assert_array_almost_equal(d.getNodeElevations(), expected, err_msg=err_msg)
+                with self.assertRaises(IndexError):
+                    d.setLinkDiameter(diameters[:-1])
+                with self.assertRaises(ValueError):
+                    d.api.ENsetlinkvalues([1, 2], d.ToolkitConstants.EN_DIAMETER, [10])
+                with self.assertRaises(ValueError):
+                    d.api.ENsetnodevalues([1], d.ToolkitConstants.EN_ELEVATION, [10, 20])
+                if ph:
+                    d.unload()
+
 
 class AnalysisTest(unittest.TestCase):
 
@@ -3848,5 +3913,297 @@ class AnalysisTest(unittest.TestCase):
         np.testing.assert_array_almost_equal(actual_20, desired_20, err_msg=err_msg, decimal=5)
 
 
+class NetworkFilesTest(unittest.TestCase):
+
+    def testBundledNetworkByName(self):
+        d = epanet('Net1.inp', ph=False)
+        try:
+            networks_dir = os.path.dirname(networks.__file__)
+            self.assertTrue(os.path.abspath(d.InputFile).startswith(networks_dir),
+                            'Bundled network not resolved by bare name')
+            self.assertEqual(d.getNodeCount(), 11, 'Wrong network loaded')
+        finally:
+            d.unload()
+
+    def testUnknownNetworkName(self):
+        with self.assertRaises(FileNotFoundError):
+            epanet('NoSuchNetwork.inp', ph=False)
+
+    def testUserPathOverBundledName(self):
+        net2 = epanet('Net2.inp', ph=False)
+        net2_nodes = net2.getNodeCount()
+        net2_file = net2.InputFile
+        net2.unload()
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # A local file named like a bundled network must take precedence
+            shutil.copyfile(net2_file, os.path.join(tmpdir, 'Net1.inp'))
+            os.chdir(tmpdir)
+            try:
+                d = epanet('Net1.inp', ph=False)
+                self.assertEqual(d.InputFile, 'Net1.inp', 'Bundled network used over user file')
+                self.assertEqual(d.getNodeCount(), net2_nodes, 'Wrong network loaded')
+                d.unload()
+            finally:
+                os.chdir(cwd)
+
+    def testNetworkNamesSnapshot(self):
+        index = NetworkFiles('.inp')
+        self.assertIn('Net1.inp', index.names(), 'Bundled network not listed')
+        name = 'snapshot_test_net.inp'
+        path = os.path.join(os.path.dirname(networks.__file__), name)
+        shutil.copyfile(index.find('Net1.inp'), path)
+        try:
+            # Files added after the scan are not listed until a lookup misses
+            self.assertNotIn(name, index.names(), 'Network names were rescanned')
+            self.assertEqual(index.find(name), path, 'New network file not found')
+            self.assertIn(name, index.names(), 'Network names not updated after rescan')
+        finally:
+            os.remove(path)
+
+
+class BulkValuesTest(unittest.TestCase):
+
+    @staticmethod
+    def per_element(get, count, code):
+        return np.array([get(i, code) for i in range(1, count + 1)])
+
+    @staticmethod
+    def single_call(get):
+        def getvalues(code, values):
+            for i in range(len(values)):
+                values[i] = get(i + 1, code)
+            return 0
+        return getvalues
+
+    def testBulkMatchesPerElement(self):
+        for ph in (False, True):
+            with self.subTest(ph=ph):
+                d = epanet('Net1.inp', ph=ph)
+                api, tk = d.api, d.ToolkitConstants
+                for code in (tk.EN_DIAMETER, tk.EN_LENGTH, tk.EN_ROUGHNESS, tk.EN_INITSTATUS):
+                    np.testing.assert_array_equal(
+                        api.ENgetlinkvalues(code),
+                        self.per_element(api.ENgetlinkvalue, d.getLinkCount(), code),
+                        err_msg='Wrong bulk link values output')
+                # EN_SOURCEQUAL includes nodes without a source (error 240)
+                for code in (tk.EN_ELEVATION, tk.EN_BASEDEMAND, tk.EN_SOURCEQUAL):
+                    np.testing.assert_array_equal(
+                        api.ENgetnodevalues(code),
+                        self.per_element(api.ENgetnodevalue, d.getNodeCount(), code),
+                        err_msg='Wrong bulk node values output')
+                d.unload()
+
+    def testBulkSingleCall(self):
+        # Stands in for EN_getlinkvalues/EN_getnodevalues (EPANET 2.3) by filling the buffer
+        for ph in (False, True):
+            with self.subTest(ph=ph):
+                d = epanet('Net1.inp', ph=ph)
+                api, tk = d.api, d.ToolkitConstants
+                api._getlinkvalues = self.single_call(api.ENgetlinkvalue)
+                api._getnodevalues = self.single_call(api.ENgetnodevalue)
+                links = api.ENgetlinkvalues(tk.EN_DIAMETER)
+                nodes = api.ENgetnodevalues(tk.EN_ELEVATION)
+                self.assertEqual(links.dtype, np.float64, 'Wrong bulk link values type')
+                self.assertEqual(nodes.dtype, np.float64, 'Wrong bulk node values type')
+                np.testing.assert_array_equal(
+                    links, self.per_element(api.ENgetlinkvalue, d.getLinkCount(), tk.EN_DIAMETER),
+                    err_msg='Wrong bulk link values output')
+                np.testing.assert_array_equal(
+                    nodes, self.per_element(api.ENgetnodevalue, d.getNodeCount(), tk.EN_ELEVATION),
+                    err_msg='Wrong bulk node values output')
+                d.unload()
+
+    def testMissingBulkFunctionLookedUpOnce(self):
+        d = epanet('Net1.inp', ph=False)
+        api = d.api
+        if hasattr(api._lib, 'ENgetlinkvalues'):
+            d.unload()
+            self.skipTest('Library provides ENgetlinkvalues')
+        api.ENgetlinkvalues(d.ToolkitConstants.EN_DIAMETER)
+        api._bind = None  # a second lookup would fail
+        api.ENgetlinkvalues(d.ToolkitConstants.EN_DIAMETER)
+        del api._bind
+        d.unload()
+
+
+class CacheInvalidationTest(unittest.TestCase):
+    """Each mutation must clear the cached counts, IDs, indices and end nodes."""
+
+    def setUp(self):
+        """Call before every test case."""
+        self.epanetClass = epanet('Net1.inp', ph=False)
+
+    def tearDown(self):
+        """Call after every test case."""
+        self.epanetClass.unload()
+
+    def read(self):
+        """Reads (and so caches) every cached lookup."""
+        d = self.epanetClass
+        node_ids, link_ids = d.getNodeNameID(), d.getLinkNameID()
+        return {'nodes': d.getNodeCount(), 'links': d.getLinkCount(),
+                'node_ids': node_ids, 'link_ids': link_ids,
+                'node_index': [d.getNodeIndex(i) for i in node_ids],
+                'link_index': [d.getLinkIndex(i) for i in link_ids],
+                'link_nodes': d.getLinkNodesIndex().tolist() if link_ids else []}
+
+    def assertConsistent(self, values):
+        d = self.epanetClass
+        self.assertEqual(values['nodes'], len(values['node_ids']), 'Stale node count')
+        self.assertEqual(values['links'], len(values['link_ids']), 'Stale link count')
+        self.assertEqual(values['node_index'], list(range(1, values['nodes'] + 1)), 'Stale node index')
+        self.assertEqual(values['link_index'], list(range(1, values['links'] + 1)), 'Stale link index')
+        self.assertEqual(values['link_nodes'], [d.api.ENgetlinknodes(i) for i in values['link_index']],
+                         'Stale link nodes')
+
+    def testAdd(self):
+        d = self.epanetClass
+        before = self.read()
+        junction = d.addNodeJunction('J1')
+        after = self.read()
+        self.assertEqual(after['nodes'], before['nodes'] + 1, 'Stale node count')
+        self.assertEqual(d.getNodeNameID(junction), 'J1', 'Stale node ID')
+        self.assertEqual(d.getNodeIndex('J1'), junction, 'Stale node index')
+        self.assertConsistent(after)
+        pipe = d.addLinkPipe('P1', 'J1', '10')
+        after = self.read()
+        self.assertEqual(after['links'], before['links'] + 1, 'Stale link count')
+        self.assertEqual(d.getLinkNameID(pipe), 'P1', 'Stale link ID')
+        self.assertEqual(d.getLinkIndex('P1'), pipe, 'Stale link index')
+        self.assertEqual(d.getLinkNodesIndex(pipe).tolist(), [junction, d.getNodeIndex('10')],
+                         'Stale link nodes')
+        self.assertConsistent(after)
+
+    def testDelete(self):
+        d = self.epanetClass
+        before = self.read()
+        d.deleteLink('10')
+        after = self.read()
+        self.assertNotIn('10', after['link_ids'], 'Stale link ID')
+        self.assertEqual(after['links'], before['links'] - 1, 'Stale link count')
+        self.assertConsistent(after)
+        d.deleteNode('32')
+        after = self.read()
+        self.assertNotIn('32', after['node_ids'], 'Stale node ID')
+        self.assertEqual(after['nodes'], before['nodes'] - 1, 'Stale node count')
+        self.assertLess(after['links'], before['links'] - 1, 'Stale link count')
+        self.assertConsistent(after)
+
+    def testSetIDs(self):
+        d = self.epanetClass
+        self.read()
+        d.setNodeNameID(1, 'N1')
+        after = self.read()
+        self.assertEqual(after['node_ids'][0], 'N1', 'Stale node ID')
+        self.assertEqual(d.getNodeIndex('N1'), 1, 'Stale node index')
+        self.assertConsistent(after)
+        d.setLinkNameID(1, 'L1')
+        after = self.read()
+        self.assertEqual(after['link_ids'][0], 'L1', 'Stale link ID')
+        self.assertEqual(d.getLinkIndex('L1'), 1, 'Stale link index')
+        self.assertConsistent(after)
+
+    def testSetLinkNodes(self):
+        d = self.epanetClass
+        self.read()
+        d.setLinkNodesIndex(1, 3, 4)
+        self.assertEqual(d.getLinkNodesIndex(1).tolist(), [3, 4], 'Stale link nodes')
+        self.assertConsistent(self.read())
+
+    def testCloseOpenInit(self):
+        d = self.epanetClass
+        self.read()
+        # A project handle, so opening Net2 leaves the legacy project alone
+        net2 = epanet('Net2.inp', ph=True)
+        net2_values = {'nodes': net2.getNodeCount(), 'node_ids': net2.getNodeNameID(),
+                       'link_ids': net2.getLinkNameID()}
+        net2_file = net2.InputFile
+        net2.unload()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            d.closeNetwork()
+            d.loadEPANETFile(net2_file, os.path.join(tmpdir, 'net2.txt'), os.path.join(tmpdir, 'net2.bin'))
+            after = self.read()
+            self.assertEqual(after['nodes'], net2_values['nodes'], 'Stale node count')
+            self.assertEqual(after['node_ids'], net2_values['node_ids'], 'Stale node IDs')
+            self.assertEqual(after['link_ids'], net2_values['link_ids'], 'Stale link IDs')
+            self.assertConsistent(after)
+            d.closeNetwork()
+        d.initializeEPANET(d.ToolkitConstants.EN_GPM, d.ToolkitConstants.EN_HW)
+        after = self.read()
+        self.assertEqual((after['nodes'], after['links']), (0, 0), 'Stale counts')
+        self.assertEqual(after['node_ids'], [], 'Stale node IDs')
+        d.addNodeJunction('J1')
+        self.assertEqual(d.getNodeNameID(), ['J1'], 'Stale node IDs')
+        self.assertEqual(d.getNodeIndex('J1'), 1, 'Stale node index')
+
+    def testSetLinkType(self):
+        # The legacy project from setUp, then a project-handle one
+        for ph in (False, True):
+            with self.subTest(ph=ph):
+                d = epanet('Net1.inp', ph=True) if ph else self.epanetClass
+                pipes, pumps = d.getLinkPipeCount(), d.getLinkPumpCount()
+                types = d.getLinkType()
+                index = d.setLinkTypePump('10')
+                self.assertEqual(d.getLinkType(index), 'PUMP', 'Stale link type')
+                self.assertEqual(d.getLinkPumpCount(), pumps + 1, 'Stale pump count')
+                self.assertEqual(d.getLinkPipeCount(), pipes - 1, 'Stale pipe count')
+                self.assertEqual(d.getLinkType().count('PUMP'), types.count('PUMP') + 1,
+                                 'Stale link types')
+                if ph:
+                    d.unload()
+
+    def testSetCurve(self):
+        d = self.epanetClass
+        self.assertEqual(d.getCurveLengths(1), 1, 'Wrong curve length output')
+        d.setCurve(1, [[1000, 200], [1500, 150], [2000, 100]])
+        self.assertEqual(d.getCurveLengths(1), 3, 'Stale curve length')
+        self.assertEqual(d.getCurveLengths(), [3], 'Stale curve lengths')
+        self.assertEqual(d.getCurveNameID(1), '1', 'Wrong curve ID output')
+        self.assertEqual(d.getCurveIndex('1'), 1, 'Wrong curve index output')
+        d.setCurveNameID(1, 'C1')
+        self.assertEqual(d.getCurveNameID(1), 'C1', 'Stale curve ID')
+        self.assertEqual(d.getCurveNameID(), ['C1'], 'Stale curve IDs')
+        self.assertEqual(d.getCurveIndex('C1'), 1, 'Stale curve index')
+        self.assertEqual(d.getCurveLengths(1), 3, 'Wrong curve length output')
+        # Setting the point after the last one appends it
+        d.setCurveValue(1, 4, [2500, 50])
+        self.assertEqual(d.getCurveLengths(1), 4, 'Stale curve length')
+        self.assertEqual(d.getCurveValue(1), {1: [[1000, 200], [1500, 150], [2000, 100], [2500, 50]]},
+                         'Stale curve values')
+
+    def testSetTitle(self):
+        d = self.epanetClass
+        self.assertEqual(d.getTitle()[0].strip(), 'EPANET Example Network 1', 'Wrong title output')
+        d.setTitle('Line 1', 'Line 2', 'Line 3')
+        self.assertEqual(d.getTitle(), ['Line 1', 'Line 2', 'Line 3'], 'Stale title')
+
+    def testVersion(self):
+        d = self.epanetClass
+        version = d.getVersion()
+        self.assertEqual(version, 20200, 'Wrong version output')
+        d.setTitle('Line 1')
+        self.assertEqual(d.getVersion(), version, 'Wrong cached version output')
+
+    def testSetLinkVertices(self):
+        d = self.epanetClass
+        self.assertEqual(d.getLinkVerticesCount(1), 0, 'Wrong vertices count output')
+        d.setLinkVertices('10', [22, 24], [69, 68])
+        self.assertEqual(d.getLinkVerticesCount(1), 2, 'Stale vertices count')
+        self.assertEqual(d.getLinkVerticesCount()[:2], [2, 0], 'Stale vertices counts')
+        for x, y, vertex in (([22], [69], 2), ([22, 24], [69], 2), ([22, 24], [69, 68], 1)):
+            with self.assertRaises(ValueError):
+                d.api.ENsetvertices(1, x, y, vertex)
+        self.assertEqual(d.getLinkVerticesCount(1), 2, 'Vertices changed')
+
+    def testSetPatternNameID(self):
+        d = self.epanetClass
+        self.assertEqual(d.getPatternIndex('1'), 1, 'Wrong pattern index output')
+        d.setPatternNameID(1, 'P1')
+        self.assertEqual(d.getPatternIndex('P1'), 1, 'Stale pattern index')
+        with self.assertWarns(UserWarning):
+            self.assertEqual(d.getPatternIndex('1'), 0, 'Stale pattern index')
+
+
 if __name__ == "__main__":
     unittest.main()  # run all tests
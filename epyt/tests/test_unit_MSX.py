@@ -238,6 +238,9 @@ class MSXtest(unittest.TestCase):
                          'Wrong set/get patternvalue comment output')
         self.assertEqual(self.msxClass.MSXgetpatternvalue(x, 6), 0.3,
                          'Wrong set/get patternvalue comment output')
+        with self.assertRaises(ValueError):
+            self.msxClass.MSXsetpattern(x, [0.5, 0.8], 6)
+        self.assertEqual(self.msxClass.MSXgetpatternlen(x), 6, 'Wrong patternlen output')
 
     def test_MSXsavesmsxfile(self):
         filename = "net-test-1.msx"
@@ -278,6 +281,13 @@ class MSXtest(unittest.TestCase):
             if tleft <= 0:
                 break
 
+    def test_MSXerrorKeepsHeldBuffer(self):
+        # An error lookup must not reuse a same-size buffer the caller still holds
+        held = self.msxClass._epanetmsxapi__string_buffer(256)
+        held.value = b'NH2CL'
+        self.msxClass.MSXerror(503)
+        self.assertEqual(held.value, b'NH2CL', 'Error message overwrote a held buffer')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 from epyt import epanet, networks
+from epyt.epanet import read_msx_options
 import unittest
 import os
 
@@ -89,6 +90,26 @@ class MSXtest(unittest.TestCase):
         self.assertEqual(self.epanetClass.getMSXRtol(),
                          0.2, "Wrong get RTOL comments output")
 
+    def test_MSXOptionsRewriteClearsCache(self):
+        # A rewrite can keep the file's size and (on a coarse-mtime filesystem) its
+        # modification time, so reading with the old stat key must still see the new options
+        self.epanetClass.setMSXTimeStep(400)
+        self.epanetClass.setMSXSolverEUL()
+        self.assertEqual(self.epanetClass.getMSXTimeStep(),
+                         400, 'Wrong get timestep comment output')
+        msxfile = self.epanetClass.MSXTempFile
+        stat = os.stat(msxfile)
+
+        self.epanetClass.setMSXTimeStep(500)
+        self.epanetClass.setMSXSolverRK5()
+        options = dict(read_msx_options(msxfile, stat.st_mtime_ns, stat.st_size))
+        self.assertEqual(options["TIMESTEP"], 500, 'Stale MSX timestep after rewrite')
+        self.assertEqual(options["SOLVER"], "RK5", 'Stale MSX solver after rewrite')
+        self.assertEqual(self.epanetClass.getMSXTimeStep(),
+                         500, 'Wrong get timestep comment output')
+        self.assertEqual(self.epanetClass.getMSXSolver(),
+                         "RK5", "Wrong get Solver comments output")
+
     def test_Parameters(self):
         self.assertEqual(self.epanetClass.getMSXEquationsTerms(),
                          (["Kf     1.5826e-4 * RE^0.88 / D"]), 'Wrong get Equations comment output')